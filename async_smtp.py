@@ -0,0 +1,301 @@
+import asyncio
+import base64
+import copy
+import re
+import smtplib
+import socket
+import ssl
+import time
+from contextlib import asynccontextmanager
+from email.generator import BytesGenerator
+from email.message import Message
+from email.utils import getaddresses
+from io import BytesIO
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from smtp_pool import CONNECTION_ERRORS, REPLY_ERRORS
+
+# Body lines starting with a dot get a second one so they are not read as the end of data
+DOT_STUFF_RE = re.compile(rb'^\.', re.MULTILINE)
+
+
+def message_envelope(msg: Message) -> Tuple[str, List[str], bytes]:
+    """Get a message's envelope sender, recipients and CRLF wire form, as smtplib.send_message would."""
+    sender = getaddresses(msg.get_all('Sender', []) or msg.get_all('From', []))[0][1]
+    recipients = [address for _, address in
+                  getaddresses(msg.get_all('To', []) + msg.get_all('Cc', []) + msg.get_all('Bcc', []))]
+
+    # Bcc recipients get the message without seeing each other
+    if 'Bcc' in msg:
+        msg = copy.copy(msg)
+        del msg['Bcc']
+
+    buffer = BytesIO()
+    BytesGenerator(buffer, policy=msg.policy.clone(linesep='\r\n')).flatten(msg, linesep='\r\n')
+    return sender, recipients, buffer.getvalue()
+
+
+class AsyncSMTPConnection:
+    """One SMTP session over asyncio streams, failing with smtplib's exception types.
+
+    Every connect, command and body write times out after ``timeout`` seconds.
+    """
+
+    def __init__(self, host: str, port: int, timeout: float = 30):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.extensions: Dict[str, str] = {}
+        self.last_used = time.monotonic()
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def connect(self, local_hostname: str, user: str = "", password: str = "", use_tls: bool = True):
+        """Open the session, upgrade it with STARTTLS and log in."""
+        self.reader, self.writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port),
+                                                          self.timeout)
+        try:
+            code, text = await self._reply()
+            if code != 220:
+                raise smtplib.SMTPConnectError(code, text)
+            await self.ehlo(local_hostname)
+
+            if use_tls:
+                if 'starttls' not in self.extensions:
+                    raise smtplib.SMTPNotSupportedError("STARTTLS extension not supported by server.")
+                code, text = await self.command('STARTTLS')
+                if code != 220:
+                    raise smtplib.SMTPResponseException(code, text)
+                await asyncio.wait_for(self.writer.start_tls(ssl.create_default_context(),
+                                                             server_hostname=self.host), self.timeout)
+                # The server forgets what it advertised before the upgrade
+                await self.ehlo(local_hostname)
+
+            if user:
+                await self.login(user, password)
+        except BaseException:
+            self.close()
+            raise
+
+    async def ehlo(self, local_hostname: str):
+        code, text = await self.command(f'EHLO {local_hostname}')
+        if code != 250:
+            raise smtplib.SMTPHeloError(code, text)
+        self.extensions = {}
+        for line in text.split('\n')[1:]:
+            name, _, params = line.partition(' ')
+            self.extensions[name.lower()] = params
+
+    async def login(self, user: str, password: str):
+        if 'auth' not in self.extensions:
+            raise smtplib.SMTPNotSupportedError("SMTP AUTH extension not supported by server.")
+        token = base64.b64encode(f'\0{user}\0{password}'.encode()).decode()
+        code, text = await self.command(f'AUTH PLAIN {token}')
+        if code != 235:
+            raise smtplib.SMTPAuthenticationError(code, text)
+
+    async def send(self, sender: str, recipients: List[str], data: bytes):
+        """Send one message; the session stays usable if the server refuses it."""
+        code, text = await self.command(f'MAIL FROM:<{sender}>')
+        if code != 250:
+            await self.reset()
+            raise smtplib.SMTPSenderRefused(code, text, sender)
+
+        refused = {}
+        for recipient in recipients:
+            code, text = await self.command(f'RCPT TO:<{recipient}>')
+            if code not in (250, 251):
+                refused[recipient] = (code, text)
+        if len(refused) == len(recipients):
+            await self.reset()
+            raise smtplib.SMTPRecipientsRefused(refused)
+
+        code, text = await self.command('DATA')
+        if code != 354:
+            await self.reset()
+            raise smtplib.SMTPDataError(code, text)
+
+        data = DOT_STUFF_RE.sub(b'..', data)
+        if not data.endswith(b'\r\n'):
+            data += b'\r\n'
+        await self._write(data + b'.\r\n')
+        code, text = await self._reply()
+        if code != 250:
+            await self.reset()
+            raise smtplib.SMTPDataError(code, text)
+
+        self.last_used = time.monotonic()
+
+    async def noop(self) -> bool:
+        """Check the session is still alive."""
+        try:
+            return (await self.command('NOOP'))[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    async def reset(self):
+        await self.command('RSET')
+
+    async def quit(self):
+        """Say goodbye and close, ignoring a server that has already gone."""
+        try:
+            await self.command('QUIT')
+        except (smtplib.SMTPException, OSError):
+            pass
+        finally:
+            self.close()
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    async def command(self, line: str) -> Tuple[int, str]:
+        """Send a command line and return the reply's code and text."""
+        await self._write(line.encode() + b'\r\n')
+        return await self._reply()
+
+    async def _write(self, data: bytes):
+        if self.writer is None:
+            raise smtplib.SMTPServerDisconnected("please run connect() first")
+        self.writer.write(data)
+        await asyncio.wait_for(self.writer.drain(), self.timeout)
+
+    async def _reply(self) -> Tuple[int, str]:
+        lines = []
+        while True:
+            line = await asyncio.wait_for(self.reader.readline(), self.timeout)
+            if not line:
+                self.close()
+                raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+            lines.append(line[4:].strip().decode(errors='replace'))
+
+            # '250-' continues a multi-line reply; '250 ' ends it
+            if line[3:4] != b'-':
+                try:
+                    return int(line[:3]), '\n'.join(lines)
+                except ValueError:
+                    self.close()
+                    raise smtplib.SMTPServerDisconnected("Malformed reply from server")
+
+
+class _ServerPool:
+    """Idle sessions to one server and the slots capping how many are open."""
+
+    def __init__(self, max_connections: int):
+        self.idle: List[AsyncSMTPConnection] = []
+        self.slots = asyncio.Semaphore(max_connections)
+
+
+class AsyncSMTPEngine:
+    """Sends many messages at once from one event loop over pooled SMTP sessions.
+
+    At most ``concurrency`` messages are in flight and at most
+    ``max_connections`` sessions are open to any one server; the rest wait
+    their turn. Sessions are reused the way SMTPPool's are: checked with
+    NOOP after ``noop_after`` idle seconds and closed after
+    ``idle_timeout``. A message whose session turns out to be dropped is
+    retried once on a new one. Use it from a single event loop.
+    """
+
+    def __init__(self, user: str, password: str, concurrency: int = 200, max_connections: int = 20,
+                 timeout: float = 30, idle_timeout: float = 120, noop_after: float = 15,
+                 use_tls: bool = True):
+        self.user = user
+        self.password = password
+        self.concurrency = concurrency
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.noop_after = noop_after
+        self.use_tls = use_tls
+        self.counters = {'sent': 0, 'errors': 0, 'connects': 0, 'reuses': 0, 'health_checks': 0, 'discards': 0}
+        self._pools: Dict[Tuple[str, int], _ServerPool] = {}
+        self._in_flight: Optional[asyncio.Semaphore] = None
+        self._local_hostname: Optional[str] = None
+
+    async def send(self, msg: Message, host: str, port: int):
+        """Send a message through the given server, raising smtplib's errors on failure."""
+        sender, recipients, data = message_envelope(msg)
+        if self._in_flight is None:
+            self._in_flight = asyncio.Semaphore(self.concurrency)
+
+        async with self._in_flight:
+            try:
+                for attempt in range(2):
+                    try:
+                        async with self.session(host, port) as connection:
+                            await connection.send(sender, recipients, data)
+                        break
+                    except CONNECTION_ERRORS:
+                        if attempt:
+                            raise
+            except BaseException:
+                self.counters['errors'] += 1
+                raise
+            self.counters['sent'] += 1
+
+    async def send_many(self, messages: List[Message], host: str, port: int) -> List[Optional[BaseException]]:
+        """Send messages concurrently, returning None or the error for each, in order."""
+        results = await asyncio.gather(*(self.send(msg, host, port) for msg in messages),
+                                       return_exceptions=True)
+        return [result if isinstance(result, BaseException) else None for result in results]
+
+    @asynccontextmanager
+    async def session(self, host: str, port: int) -> AsyncIterator[AsyncSMTPConnection]:
+        """Borrow a logged-in session to a server, closing it if the block fails other than by a refusal."""
+        pool = self._pools.get((host, port))
+        if pool is None:
+            pool = self._pools[(host, port)] = _ServerPool(self.max_connections)
+
+        async with pool.slots:
+            connection = await self._acquire(pool, host, port)
+            try:
+                yield connection
+            except REPLY_ERRORS:
+                pool.idle.append(connection)
+                raise
+            except BaseException:
+                self.counters['discards'] += 1
+                connection.close()
+                raise
+            else:
+                pool.idle.append(connection)
+
+    async def _acquire(self, pool: _ServerPool, host: str, port: int) -> AsyncSMTPConnection:
+        while pool.idle:
+            # Most recently used first: the likeliest to still be alive
+            connection = pool.idle.pop()
+            idle_for = time.monotonic() - connection.last_used
+            if idle_for <= self.idle_timeout:
+                if idle_for > self.noop_after:
+                    self.counters['health_checks'] += 1
+                    healthy = await connection.noop()
+                else:
+                    healthy = True
+                if healthy:
+                    self.counters['reuses'] += 1
+                    return connection
+            self.counters['discards'] += 1
+            await connection.quit()
+
+        if self._local_hostname is None:
+            # getfqdn may block on DNS, so it runs once, off the loop
+            self._local_hostname = await asyncio.get_running_loop().run_in_executor(None, socket.getfqdn)
+
+        connection = AsyncSMTPConnection(host, port, self.timeout)
+        await connection.connect(self._local_hostname, self.user, self.password, self.use_tls)
+        self.counters['connects'] += 1
+        return connection
+
+    def stats(self) -> Dict:
+        """Get sent/error/connect/reuse/health-check/discard counters and idle session counts."""
+        stats = dict(self.counters)
+        stats['idle'] = sum(len(pool.idle) for pool in self._pools.values())
+        return stats
+
+    async def close(self):
+        """Log out of every idle session and forget the pools, so another event loop can use the engine."""
+        connections = [connection for pool in self._pools.values() for connection in pool.idle]
+        self._pools = {}
+        self._in_flight = None
+        await asyncio.gather(*(connection.quit() for connection in connections))
@@ -0,0 +1,80 @@
+"""Compare concurrent job saves written inline against the background writer.
+
+Run from the repository root:
+
+    python -m benchmarks.db_writes [--threads N] [--saves N] [--jobs N]
+
+Each of N threads saves --saves batches of --jobs postings into a scratch
+database, first calling DatabaseManager.save_jobs directly (every thread
+contending for SQLite's write lock) and then through a DatabaseWriter
+(one thread committing batched transactions).
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from database import DatabaseManager
+from db_writer import DatabaseWriter
+
+
+def run_threads(threads: int, target) -> float:
+    """Run target(thread_index) on each thread and return the wall time."""
+    workers = [threading.Thread(target=target, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--saves', type=int, default=200)
+    parser.add_argument('--jobs', type=int, default=5, help="postings per save")
+    args = parser.parse_args()
+
+    def batch(case: str, thread: int, save: int):
+        return [{'title': f"Job {save}-{i}", 'link': f"https://example.com/{case}/{thread}/{save}/{i}",
+                 'source': 'Bench'} for i in range(args.jobs)]
+
+    root = tempfile.mkdtemp(prefix='jobhunter-bench-')
+    total = args.threads * args.saves * args.jobs
+    print(f"{args.threads} threads x {args.saves} saves x {args.jobs} jobs")
+    print(f"{'case':<10} {'seconds':>8} {'jobs/s':>9} {'errors':>7}")
+
+    db = DatabaseManager(os.path.join(root, 'inline.db'))
+    errors = []
+
+    def inline(thread: int):
+        for save in range(args.saves):
+            result = db.save_jobs(batch('inline', thread, save), f"user{thread}@example.com", 'bench')
+            if result['skipped']:
+                errors.append(result)
+
+    elapsed = run_threads(args.threads, inline)
+    print(f"{'inline':<10} {elapsed:>8.2f} {total / elapsed:>9.0f} {len(errors):>7}")
+    db.close()
+
+    db = DatabaseManager(os.path.join(root, 'writer.db'))
+    writer = DatabaseWriter(db)
+
+    def queued(thread: int):
+        for save in range(args.saves):
+            writer.save_jobs(batch('writer', thread, save), f"user{thread}@example.com", 'bench')
+
+    start = time.perf_counter()
+    run_threads(args.threads, queued)
+    writer.flush()
+    elapsed = time.perf_counter() - start
+    stats = writer.stats()
+    print(f"{'writer':<10} {elapsed:>8.2f} {total / elapsed:>9.0f} {stats['errors']:>7}"
+          f"   ({stats['batches']} transactions)")
+    writer.close()
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Benchmark digest rendering for growing numbers of jobs.
+
+Run from the repository root:
+
+    python -m benchmarks.digest [--repeat N]
+
+Compares the compiled DigestRenderer, which escapes values and produces
+both the HTML and plain-text bodies, with the unescaped string-concatenation
+renderer it replaced (HTML only). It reports median render time and peak
+traced allocation.
+"""
+import argparse
+import statistics
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List
+from digest_template import DigestRenderer
+
+SIZES = [10, 100, 1000, 10000]
+
+
+def legacy_email_body(jobs: List[Dict], job_role: str, location: str) -> str:
+    """The previous EmailSender._create_email_body, kept as the baseline."""
+    current_date = datetime.now().strftime("%B %d, %Y")
+
+    html_body = f"""
+        <html>
+        <head>
+            <style>
+                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
+                .header {{ background-color: #f4f4f4; padding: 20px; border-radius: 5px; margin-bottom: 20px; }}
+                .job-item {{ border: 1px solid #ddd; border-radius: 5px; padding: 15px; margin-bottom: 15px; }}
+                .job-title {{ font-size: 18px; font-weight: bold; color: #2c3e50; margin-bottom: 10px; }}
+                .job-link {{ color: #3498db; text-decoration: none; }}
+                .job-link:hover {{ text-decoration: underline; }}
+                .job-source {{ color: #7f8c8d; font-size: 14px; }}
+                .footer {{ margin-top: 30px; padding-top: 20px; border-top: 1px solid #ddd; text-align: center; color: #7f8c8d; }}
+            </style>
+        </head>
+        <body>
+            <div class="header">
+                <h2>🤖 Your Daily Job Updates</h2>
+                <p><strong>Search:</strong> {job_role} in {location}</p>
+                <p><strong>Date:</strong> {current_date}</p>
+                <p><strong>Jobs Found:</strong> {len(jobs)}</p>
+            </div>
+        """
+
+    if jobs:
+        html_body += "<h3>📋 Job Listings:</h3>"
+
+        for i, job in enumerate(jobs, 1):
+            html_body += f"""
+                <div class="job-item">
+                    <div class="job-title">{i}. {job['title']}</div>
+                    <p><a href="{job['link']}" class="job-link" target="_blank">🔗 View Job Application</a></p>
+                    <p class="job-source">📍 Source: {job['source']}</p>
+                </div>
+                """
+    else:
+        html_body += """
+            <div class="job-item">
+                <p>No new job listings found for your search criteria today.</p>
+                <p>Try adjusting your search parameters or check back tomorrow!</p>
+            </div>
+            """
+
+    html_body += """
+            <div class="footer">
+                <p>Sent by your AI Job Agent 🤖</p>
+                <p>This is an automated email. Please do not reply.</p>
+            </div>
+        </body>
+        </html>
+        """
+
+    return html_body
+
+
+def measure(render, repeat: int) -> Dict:
+    """Time render() repeat times, then trace its allocations once."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        render()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    render()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'ms': statistics.median(times) * 1000, 'peak_kib': peak / 1024}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    renderer = DigestRenderer()
+    print(f"{'jobs':>6} {'renderer':<18} {'median ms':>10} {'peak KiB':>10}")
+    for size in SIZES:
+        jobs = [{'title': f"Senior Python Developer & Data Engineer #{i}",
+                 'link': f"https://www.linkedin.com/jobs/view/{1000000 + i}?refId=abc&trk=digest",
+                 'source': 'LinkedIn'} for i in range(size)]
+        cases = [
+            ('concatenation', lambda: legacy_email_body(jobs, 'Python Developer', 'Remote')),
+            ('compiled (+text)', lambda: renderer.render(jobs, 'Python Developer', 'Remote')),
+        ]
+        for name, render in cases:
+            result = measure(render, max(1, args.repeat * 10 // size) if size > 10 else args.repeat)
+            print(f"{size:>6} {name:<18} {result['ms']:>10.3f} {result['peak_kib']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
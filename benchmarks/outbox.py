@@ -0,0 +1,107 @@
+"""Benchmark outbox delivery throughput for growing numbers of workers.
+
+Run from the repository root:
+
+    python -m benchmarks.outbox [--messages N] [--latency MS] [--handshake MS]
+
+Each case enqueues --messages digests into a fresh outbox in a temporary
+database and times how long EmailOutbox takes to drain it through the
+stand-in SMTP server from benchmarks.smtp, with as many pooled sessions as
+workers. Also reports how long enqueueing took, which is all producers wait for.
+
+A second table spreads the same digests over recipients with 1, 2 or 4
+saved searches each, enqueued with a short hold so each recipient's
+results are coalesced, and counts the emails and connections it took.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sqlite3
+import tempfile
+import time
+from database import DatabaseManager
+from outbox import EmailOutbox
+from benchmarks.smtp import FakeSMTPServer, build_sender, digests
+
+WORKERS = [1, 2, 4, 8]
+SUBSCRIPTIONS = [1, 2, 4]
+
+
+def drain(db_manager: DatabaseManager, outbox: EmailOutbox, count: int) -> float:
+    """Start the outbox and return the seconds until count emails are sent or failed."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        outbox.start()
+        while True:
+            stats = db_manager.get_outbox_stats()
+            if stats['sent'] + stats['failed'] >= count:
+                break
+            time.sleep(0.01)
+        elapsed = time.perf_counter() - start
+        outbox.stop()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=5, help="delay per server reply in ms")
+    parser.add_argument('--handshake', type=float, default=50, help="extra delay per connection in ms")
+    args = parser.parse_args()
+
+    server = FakeSMTPServer(args.latency / 1000, args.handshake / 1000).start()
+    messages = digests(args.messages)
+
+    print(f"{args.messages} digests, {args.latency:.0f} ms per reply, {args.handshake:.0f} ms per connection")
+    print(f"{'workers':>8} {'enqueue ms':>11} {'drain s':>8} {'msgs/s':>8} {'p50 ms':>7} {'sent':>6}")
+    for workers in WORKERS:
+        with tempfile.TemporaryDirectory() as directory:
+            db_manager = DatabaseManager(os.path.join(directory, 'jobs.db'))
+            sender = build_sender(server, workers)
+            outbox = EmailOutbox(db_manager, sender, workers=workers, poll_interval=0.05)
+
+            start = time.perf_counter()
+            for message in messages:
+                outbox.enqueue(**message)
+            enqueue_ms = (time.perf_counter() - start) * 1000
+
+            elapsed = drain(db_manager, outbox, len(messages))
+            sender.close()
+
+            with sqlite3.connect(db_manager.db_path) as conn:
+                latencies = sorted(row[0] for row in conn.execute(
+                    "SELECT latency_ms FROM outbox WHERE status = 'sent'"))
+            conn.close()
+            p50 = latencies[len(latencies) // 2] if latencies else 0
+            print(f"{workers:>8} {enqueue_ms:>11.1f} {elapsed:>8.2f} {args.messages / elapsed:>8.1f} "
+                  f"{p50:>7} {len(latencies):>6}")
+            db_manager.close()
+
+    print()
+    print(f"{'searches/user':>13} {'digests':>8} {'emails':>7} {'connections':>12} {'drain s':>8}")
+    for subscriptions in SUBSCRIPTIONS:
+        with tempfile.TemporaryDirectory() as directory:
+            db_manager = DatabaseManager(os.path.join(directory, 'jobs.db'))
+            sender = build_sender(server, 4)
+            outbox = EmailOutbox(db_manager, sender, workers=4, poll_interval=0.05)
+
+            for i, message in enumerate(messages):
+                # Each search finds its own jobs plus one every search of that user also finds
+                jobs = [dict(job, link=f"{job['link']}-{i}") for job in message['jobs']] + [message['jobs'][0]]
+                outbox.enqueue(f"user{i // subscriptions}@example.com", jobs, f"Search {i % subscriptions}",
+                               message['location'], hold_seconds=1)
+            emails = db_manager.get_outbox_stats()['pending']
+
+            connections, delivered = server.connections, server.messages
+            elapsed = drain(db_manager, outbox, emails)
+            sender.close()
+            print(f"{subscriptions:>13} {len(messages):>8} {server.messages - delivered:>7} "
+                  f"{server.connections - connections:>12} {elapsed:>8.2f}")
+            db_manager.close()
+
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark the search-result parser engines on saved result pages.
+
+Run from the repository root:
+
+    python -m benchmarks.parsers [--rounds N]
+
+Reports pages/sec and peak traced memory for every available engine.
+Peak memory comes from tracemalloc, which only sees Python allocations;
+the tree lxml builds in C is not counted.
+"""
+import argparse
+import glob
+import os
+import time
+import tracemalloc
+from typing import Dict, List
+from html_extract import EXTRACTORS, lxml
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures', 'pages')
+
+
+def load_pages(pages_dir: str = PAGES_DIR) -> List[bytes]:
+    """Load every saved results page."""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(pages_dir, '*.html'))):
+        with open(path, 'rb') as f:
+            pages.append(f.read())
+    return pages
+
+
+def bench_engine(name: str, pages: List[bytes], rounds: int) -> Dict:
+    """Time an engine over all pages and measure its peak memory on one pass."""
+    extractor = EXTRACTORS[name]()
+
+    # Warm up, then time without tracemalloc overhead
+    for page in pages:
+        extractor.extract(page)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for page in pages:
+            extractor.extract(page)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    for page in pages:
+        extractor.extract(page)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'engine': name,
+        'pages_per_sec': rounds * len(pages) / elapsed,
+        'peak_kib': peak / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rounds', type=int, default=50)
+    args = parser.parse_args()
+
+    pages = load_pages()
+    if not pages:
+        print(f"No saved pages found in {PAGES_DIR}")
+        return
+
+    total_kib = sum(len(page) for page in pages) / 1024
+    print(f"{len(pages)} pages, {total_kib:.0f} KiB total, {args.rounds} rounds")
+    print(f"{'engine':<8} {'pages/sec':>10} {'peak KiB':>10}")
+
+    for name in EXTRACTORS:
+        if name == 'lxml' and lxml is None:
+            print(f"{name:<8} {'skipped (not installed)':>21}")
+            continue
+        result = bench_engine(name, pages, args.rounds)
+        print(f"{result['engine']:<8} {result['pages_per_sec']:>10.1f} {result['peak_kib']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Time the time-window job queries against a large table.
+
+Run from the repository root:
+
+    python -m benchmarks.query_plans [--rows N]
+
+Builds a scratch database of N saved jobs and prints the timing and
+SQLite's query plan for each time-range query. That the plans use an
+index is checked by tests/test_query_plans.py.
+"""
+import argparse
+import os
+import tempfile
+import time
+from database import DatabaseManager, RECENT_JOBS_SQL
+
+EMAILS = [f"user{i}@example.com" for i in range(20)]
+
+
+def populate(db: DatabaseManager, rows: int):
+    """Insert rows jobs spread over the last 90 days and several subscribers."""
+    now = int(time.time())
+    conn = db._get_connection()
+    subscriber_ids = [db._subscriber_id(conn, email) for email in EMAILS]
+    with conn:
+        conn.executemany('''
+            INSERT INTO jobs (title, link, subscriber_id, link_hash, created_at, last_seen_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', [(f"Job {i}", f"https://example.com/jobs/{i}", subscriber_ids[i % len(EMAILS)], i,
+               now - (i * 7919) % (90 * 86400), now) for i in range(rows)])
+    conn.execute('ANALYZE')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args()
+
+    db = DatabaseManager(os.path.join(tempfile.mkdtemp(prefix='jobhunter-bench-'), 'jobs.db'))
+    populate(db, args.rows)
+
+    now = int(time.time())
+    week_ago = now - 7 * 86400
+    cases = [
+        ('recent jobs, 24h', RECENT_JOBS_SQL, (EMAILS[0], now - 86400)),
+        ('log page, one day', *db.job_logs_page_query(EMAILS[0], 50, None, now - 86400, now)),
+        ('log page, one day, all emails', *db.job_logs_page_query(None, 50, None, now - 86400, now)),
+        ('log page, after cursor', *db.job_logs_page_query(EMAILS[0], 50, (week_ago, args.rows), None, None)),
+    ]
+
+    conn = db._get_connection()
+    print(f"{args.rows} rows")
+    for name, sql, params in cases:
+        plan = db.explain_query_plan(sql, params)
+        start = time.perf_counter()
+        found = len(conn.execute(sql, params).fetchall())
+        elapsed = (time.perf_counter() - start) * 1000
+
+        print(f"{name:<32} {found:>6} rows {elapsed:>8.2f} ms")
+        for step in plan:
+            print(f"    {step}")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Benchmark the scraper hot path offline against a local stand-in server.
+
+Run from the repository root:
+
+    python -m benchmarks.scraper [--iterations N] [--latency MS]
+
+Every request the scraper makes is routed to a FixtureServer answering
+from the recorded fixtures in fixtures/http_index.json, with an optional
+fixed latency per response. For each case the benchmark reports latency
+percentiles, calls/sec, requests/sec reaching the server, and peak and
+retained memory from tracemalloc.
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+from http_cache import ResponseCache
+from http_replay import FixtureStore, FixtureServer, LoopbackAdapter, replace_transport
+from job_scraper import JobScraper
+from query_cache import QueryResultCache
+from rate_limiter import HostRateLimiter
+
+QUERIES = [
+    "Python Developer Remote fresher jobs graduate entry level",
+    "Data Scientist India 3+ years mid-level",
+    "Backend Engineer Bangalore internship intern student",
+]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Get the pct-th percentile of samples by nearest rank."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run_case(name: str, func: Callable[[], None], iterations: int, server: FixtureServer,
+             setup: Callable[[], None] = None) -> Dict:
+    """Time func over iterations, then trace memory over one more call."""
+    latencies = []
+    requests_before = server.request_count
+    wall = 0.0
+
+    for _ in range(iterations):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        latencies.append(elapsed)
+        wall += elapsed
+
+    requests_made = server.request_count - requests_before
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    func()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'case': name,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'calls_per_sec': iterations / wall if wall else 0.0,
+        'requests_per_sec': requests_made / wall if wall else 0.0,
+        'peak_kib': (peak - before) / 1024,
+        'retained_kib': (after - before) / 1024,
+    }
+
+
+def build_scraper(server: FixtureServer, cache_dir: str) -> JobScraper:
+    """Build a scraper whose traffic all goes to the stand-in server, unthrottled."""
+    scraper = JobScraper(
+        cache=ResponseCache(os.path.join(cache_dir, 'http_cache.db')),
+        rate_limiter=HostRateLimiter(host_rates={}, default_rate=(1e6, 1e6)),
+        query_cache=QueryResultCache(ttl=0),
+    )
+    replace_transport(scraper.session, LoopbackAdapter(server.url))
+    return scraper
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=50, help="simulated server latency in ms")
+    args = parser.parse_args()
+
+    store = FixtureStore()
+    if not store.entries:
+        print(f"No recorded fixtures found in {store.index_path}")
+        return
+
+    server = FixtureServer(store, latency=args.latency / 1000).start()
+    cache_dir = tempfile.mkdtemp(prefix='jobhunter-bench-')
+    scraper = build_scraper(server, cache_dir)
+
+    pages = [store.lookup('GET', url.split(' ', 1)[1])['body']
+             for url in store.entries if 'google.com/search' in url]
+    job_urls = [url.split(' ', 1)[1] for url in store.entries if 'google.com/search' not in url]
+
+    def cold():
+        scraper.cache.clear()
+        scraper._details_cache.clear()
+
+    def search_all():
+        for query in QUERIES:
+            scraper.search_jobs(query)
+
+    def parse_all():
+        for page in pages:
+            scraper._parse_results(page, 10)
+
+    def details_all():
+        for url in job_urls:
+            scraper.get_job_details(url)
+
+    def enrich_all():
+        for _ in scraper.enrich_jobs(job_urls):
+            pass
+
+    results = [
+        run_case('search_jobs (cold)', search_all, args.iterations, server, setup=cold),
+        run_case('search_jobs (warm cache)', search_all, args.iterations, server),
+        run_case(f'parse {len(pages)} pages ({scraper.extractor.name})', parse_all, args.iterations, server),
+        run_case(f'get_job_details x{len(job_urls)} (cold)', details_all, max(1, args.iterations // 4), server, setup=cold),
+        run_case(f'enrich_jobs x{len(job_urls)} (cold)', enrich_all, args.iterations, server, setup=cold),
+    ]
+
+    server.stop()
+
+    print(f"{len(store.entries)} recorded responses, {args.latency:.0f} ms simulated latency")
+    print(f"{'case':<34} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'calls/s':>8} {'req/s':>8} {'peak KiB':>9} {'kept KiB':>9}")
+    for r in results:
+        print(f"{r['case']:<34} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} "
+              f"{r['calls_per_sec']:>8.1f} {r['requests_per_sec']:>8.1f} {r['peak_kib']:>9.1f} {r['retained_kib']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Benchmark digest delivery against a local stand-in SMTP server.
+
+Run from the repository root:
+
+    python -m benchmarks.smtp [--messages N] [--latency MS] [--handshake MS]
+
+The stand-in server accepts everything and adds --latency to every reply,
+plus --handshake on connect in place of the STARTTLS negotiation it does
+not perform. Cases compare a new connection and login per message (how
+EmailSender used to send) with pooled sessions, one at a time and through
+send_many, and with AsyncEmailSender.send_many over --connections sessions.
+"""
+import argparse
+import contextlib
+import io
+import smtplib
+import socketserver
+import threading
+import time
+from async_smtp import AsyncSMTPEngine
+from email_sender import AsyncEmailSender, EmailSender
+from smtp_pool import SMTPPool
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line: str):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.wfile.write(line.encode() + b'\r\n')
+
+    def handle(self):
+        with self.server.count_lock:
+            self.server.connections += 1
+        if self.server.handshake:
+            time.sleep(self.server.handshake)
+        self.reply('220 localhost ESMTP stand-in')
+
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors='replace').strip().upper()
+
+            if command.startswith(('EHLO', 'HELO')):
+                self.reply('250-localhost\r\n250-AUTH PLAIN\r\n250 8BITMIME')
+            elif command.startswith('AUTH'):
+                self.reply('235 2.7.0 Authentication successful')
+            elif command == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                while self.rfile.readline() not in (b'.\r\n', b''):
+                    pass
+                with self.server.count_lock:
+                    self.server.messages += 1
+                self.reply('250 2.0.0 Ok: queued')
+            elif command == 'QUIT':
+                self.reply('221 2.0.0 Bye')
+                return
+            else:
+                # MAIL, RCPT, RSET, NOOP
+                self.reply('250 2.0.0 Ok')
+
+
+class FakeSMTPServer(socketserver.ThreadingTCPServer):
+    """Local SMTP server that accepts every message and counts connections."""
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 1024
+
+    def __init__(self, latency: float = 0.0, handshake: float = 0.0):
+        super().__init__(('127.0.0.1', 0), _SMTPHandler)
+        self.latency = latency
+        self.handshake = handshake
+        self.connections = 0
+        self.messages = 0
+        self.count_lock = threading.Lock()
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def start(self) -> 'FakeSMTPServer':
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def build_sender(server: FakeSMTPServer, max_sessions: int = 4) -> EmailSender:
+    """Build an EmailSender whose pooled sessions go to the stand-in server."""
+    sender = EmailSender(max_sessions=max_sessions)
+    sender.gmail_user = 'bench@example.com'
+    sender.gmail_password = 'bench'
+    sender.pool = SMTPPool('127.0.0.1', server.port, sender.gmail_user, sender.gmail_password,
+                           max_sessions=max_sessions, use_tls=False)
+    return sender
+
+
+def build_async_sender(server: FakeSMTPServer, max_connections: int = 20,
+                       concurrency: int = 200) -> AsyncEmailSender:
+    """Build an AsyncEmailSender whose engine sends to the stand-in server."""
+    sender = AsyncEmailSender(concurrency=concurrency, max_connections=max_connections)
+    sender.gmail_user = 'bench@example.com'
+    sender.gmail_password = 'bench'
+    sender.smtp_server = '127.0.0.1'
+    sender.smtp_port = server.port
+    sender.engine = AsyncSMTPEngine(sender.gmail_user, sender.gmail_password, concurrency=concurrency,
+                                    max_connections=max_connections, use_tls=False)
+    return sender
+
+
+def digests(count: int, jobs_per_digest: int = 10):
+    """Build send_job_email arguments for count digests."""
+    jobs = [{'title': f"Python Developer {i}", 'link': f"https://example.com/jobs/{i}", 'source': 'LinkedIn'}
+            for i in range(jobs_per_digest)]
+    return [{'recipient_email': f"user{i}@example.com", 'jobs': jobs,
+             'job_role': 'Python Developer', 'location': 'Remote'} for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=5, help="delay per server reply in ms")
+    parser.add_argument('--handshake', type=float, default=50, help="extra delay per connection in ms")
+    parser.add_argument('--sessions', type=int, default=4)
+    parser.add_argument('--connections', type=int, default=20, help="sessions for the asyncio engine")
+    args = parser.parse_args()
+
+    server = FakeSMTPServer(args.latency / 1000, args.handshake / 1000).start()
+    messages = digests(args.messages)
+    sender = build_sender(server, args.sessions)
+    async_sender = build_async_sender(server, args.connections)
+
+    def connect_per_message():
+        for message in messages:
+            msg = sender.build_job_message(**message)
+            with smtplib.SMTP('127.0.0.1', server.port) as smtp:
+                smtp.login(sender.gmail_user, sender.gmail_password)
+                smtp.send_message(msg)
+
+    def pooled():
+        for message in messages:
+            sender.send_job_email(**message)
+
+    def send_many():
+        sender.send_many(messages)
+
+    def async_send_many():
+        async_sender.send_many(messages)
+
+    print(f"{args.messages} digests, {args.latency:.0f} ms per reply, {args.handshake:.0f} ms per connection")
+    print(f"{'case':<28} {'seconds':>8} {'msgs/s':>8} {'ms/msg':>8} {'connections':>12}")
+    for name, run in [('connect per message', connect_per_message), ('pooled, one at a time', pooled),
+                      (f'send_many ({args.sessions} sessions)', send_many),
+                      (f'async send_many ({args.connections} conns)', async_send_many)]:
+        sender.close()
+        async_sender.close()
+        connections = server.connections
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            run()
+        elapsed = time.perf_counter() - start
+        print(f"{name:<28} {elapsed:>8.2f} {args.messages / elapsed:>8.1f} "
+              f"{elapsed * 1000 / args.messages:>8.1f} {server.connections - connections:>12}")
+
+    sender.close()
+    async_sender.close()
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,79 +1,897 @@
 import sqlite3
+import json
 import os
-from datetime import datetime
-from typing import List, Dict, Optional
+import threading
+import time
+from datetime import date, datetime, timezone
+from typing import List, Dict, Optional, Iterator, Tuple, Union
+from url_utils import link_hash
+
+# Connection tuning applied to every pooled connection
+CONNECTION_PRAGMAS = [
+    'PRAGMA synchronous=NORMAL',      # WAL keeps this crash-safe while skipping an fsync per commit
+    'PRAGMA cache_size=-16000',       # 16 MB page cache
+    'PRAGMA mmap_size=268435456',     # Read pages through a 256 MB memory map
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA foreign_keys=ON'
+]
+
+# Seconds to wait on a locked database before giving up
+BUSY_TIMEOUT = 30
+
+# Jobs no search has turned up for this many days are archived or deleted by purge_old_jobs
+DEFAULT_RETENTION_DAYS = 180
+
+# The next chunk of jobs no search has turned up since a cutoff, oldest first
+STALE_JOBS_SQL = '''
+    SELECT id, created_at FROM jobs
+    WHERE last_seen_at < ?
+    ORDER BY last_seen_at
+    LIMIT ?
+'''
+
+# Layout of the monthly archive files old jobs are moved into
+ARCHIVE_TABLE = '''
+    CREATE TABLE IF NOT EXISTS archive.jobs (
+        title TEXT NOT NULL,
+        link TEXT NOT NULL,
+        email TEXT NOT NULL,
+        source TEXT,
+        search_query TEXT,
+        link_hash INTEGER NOT NULL,
+        created_at INTEGER NOT NULL,
+        last_seen_at INTEGER NOT NULL,
+        seen_count INTEGER NOT NULL,
+        UNIQUE (email, link_hash, created_at)
+    )
+'''
+
+# Job timestamps are stored as UTC epoch seconds and read back in the
+# 'YYYY-MM-DD HH:MM:SS' form callers have always received
+TIMESTAMP_COLUMN = "strftime('%Y-%m-%d %H:%M:%S', created_at, 'unixepoch') AS timestamp"
+
+RECENT_JOBS_SQL = f'''
+    SELECT title, link, email, source, search_query, {TIMESTAMP_COLUMN}
+    FROM job_log
+    WHERE email = ? AND created_at > ?
+    ORDER BY created_at DESC
+'''
+
+# Which of a batch of link hashes were already delivered to an email; format in the placeholders
+DELIVERED_HASHES_SQL = '''
+    SELECT d.link_hash FROM delivered_links d
+    JOIN subscribers s ON s.id = d.subscriber_id
+    WHERE s.email = ? AND d.link_hash IN ({placeholders})
+'''
+
+def _chunks(values: List, size: int = 500) -> List[List]:
+    """Split values into lists small enough to bind under SQLite's variable limit."""
+    return [values[i:i + size] for i in range(0, len(values), size)]
+
+def to_epoch(value: Union[int, float, str, date, datetime]) -> int:
+    """Convert a date, datetime, 'YYYY-MM-DD[ HH:MM:SS]' string or epoch to epoch seconds.
+    
+    Naive dates and times are taken as UTC, matching how timestamps are stored.
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
 
 class DatabaseManager:
     def __init__(self, db_path: str = "jobs.db"):
         self.db_path = db_path
+        self._local = threading.local()
+        self._connections = {}
+        self._connections_lock = threading.Lock()
+        self._dimension_ids = {}
+        self._dimension_lock = threading.Lock()
         self.init_database()
     
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get this thread's long-lived connection, opening and tuning it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            return conn
+        
+        conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT, check_same_thread=False,
+                               cached_statements=256)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        
+        with self._connections_lock:
+            # Close connections left behind by threads that have exited
+            alive = {thread.ident for thread in threading.enumerate()}
+            for ident in list(self._connections):
+                if ident not in alive:
+                    self._connections.pop(ident).close()
+            self._connections[threading.get_ident()] = conn
+        
+        self._local.conn = conn
+        return conn
+    
+    def close(self):
+        """Close every pooled connection."""
+        with self._connections_lock:
+            for conn in self._connections.values():
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+    
     def init_database(self):
-        """Initialize the SQLite database with required tables."""
+        """Initialize the SQLite database and apply any pending schema migrations."""
+        try:
+            conn = self._get_connection()
+            
+            # Let deletes hand freed pages back to the filesystem. This only
+            # takes effect before the first table is created or after a VACUUM.
+            conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+            
+            # Write-ahead logging lets readers proceed while a write is in progress
+            conn.execute('PRAGMA journal_mode=WAL')
+            
+            migrations = self._migrations()
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            
+            for target, migration in enumerate(migrations[version:], start=version + 1):
+                # Take the write lock first so concurrent processes migrate once
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    if conn.execute('PRAGMA user_version').fetchone()[0] >= target:
+                        conn.rollback()
+                        continue
+                    migration(conn.cursor())
+                    conn.execute(f'PRAGMA user_version = {target}')
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+            
+            # Databases created before incremental vacuum need one full rebuild
+            if conn.execute('PRAGMA auto_vacuum').fetchone()[0] != 2:
+                conn.execute('VACUUM')
+                
+        except sqlite3.Error as e:
+            print(f"Database initialization error: {e}")
+            raise
+    
+    def _migrations(self) -> List:
+        """Schema migrations in order; the database's user_version counts those applied."""
+        return [
+            self._migrate_initial_schema,
+            self._migrate_link_hash,
+            self._migrate_epoch_timestamps,
+            self._migrate_normalized_dimensions,
+            self._migrate_job_stats,
+            self._migrate_full_text_search,
+            self._migrate_outbox,
+            self._migrate_last_seen_index
+        ]
+    
+    def _migrate_initial_schema(self, cursor: sqlite3.Cursor):
+        """Create the original jobs and delivered_links tables."""
+        # Create jobs table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                link TEXT NOT NULL,
+                email TEXT NOT NULL,
+                source TEXT,
+                search_query TEXT,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Create index for better query performance
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_email ON jobs(email)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_timestamp ON jobs(timestamp)')
+        
+        # Create per-subscriber index of postings already delivered,
+        # keyed by a 64-bit hash of the canonical link
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS delivered_links (
+                email TEXT NOT NULL,
+                link_hash INTEGER NOT NULL,
+                delivered_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (email, link_hash)
+            ) WITHOUT ROWID
+        ''')
+    
+    def _migrate_link_hash(self, cursor: sqlite3.Cursor):
+        """Add link hashes to the jobs table and merge duplicate rows."""
+        columns = {row[1] for row in cursor.execute('PRAGMA table_info(jobs)')}
+        if 'link_hash' not in columns:
+            cursor.execute('ALTER TABLE jobs ADD COLUMN link_hash INTEGER')
+            cursor.execute('ALTER TABLE jobs ADD COLUMN last_seen DATETIME')
+            cursor.execute('ALTER TABLE jobs ADD COLUMN seen_count INTEGER NOT NULL DEFAULT 1')
+        
+        rows = cursor.execute('SELECT id, link FROM jobs WHERE link_hash IS NULL').fetchall()
+        cursor.executemany('UPDATE jobs SET link_hash = ? WHERE id = ?',
+                           [(link_hash(link), row_id) for row_id, link in rows])
+        
+        # Keep the first row of each (email, link_hash) group, carrying over
+        # when it was last seen and how many times it was saved
+        cursor.execute('''
+            UPDATE jobs SET
+                last_seen = (SELECT MAX(COALESCE(d.last_seen, d.timestamp)) FROM jobs d
+                             WHERE d.email = jobs.email AND d.link_hash = jobs.link_hash),
+                seen_count = (SELECT SUM(d.seen_count) FROM jobs d
+                              WHERE d.email = jobs.email AND d.link_hash = jobs.link_hash)
+            WHERE (email, link_hash) IN (
+                SELECT email, link_hash FROM jobs GROUP BY email, link_hash HAVING COUNT(*) > 1
+            )
+        ''')
+        cursor.execute('''
+            DELETE FROM jobs WHERE id NOT IN (
+                SELECT MIN(id) FROM jobs GROUP BY email, link_hash
+            )
+        ''')
+        
+        # One row per posting per subscriber
+        cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_email_link_hash ON jobs(email, link_hash)')
+    
+    def _migrate_epoch_timestamps(self, cursor: sqlite3.Cursor):
+        """Rebuild the jobs table with integer epoch timestamps and an (email, created_at) index."""
+        cursor.execute('''
+            CREATE TABLE jobs_new (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                link TEXT NOT NULL,
+                email TEXT NOT NULL,
+                source TEXT,
+                search_query TEXT,
+                link_hash INTEGER NOT NULL,
+                created_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+                last_seen_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+                seen_count INTEGER NOT NULL DEFAULT 1
+            )
+        ''')
+        cursor.execute('''
+            INSERT INTO jobs_new (id, title, link, email, source, search_query, link_hash,
+                                  created_at, last_seen_at, seen_count)
+            SELECT id, title, link, email, source, search_query, link_hash,
+                   COALESCE(CAST(strftime('%s', timestamp) AS INTEGER), CAST(strftime('%s', 'now') AS INTEGER)),
+                   COALESCE(CAST(strftime('%s', COALESCE(last_seen, timestamp)) AS INTEGER),
+                            CAST(strftime('%s', 'now') AS INTEGER)),
+                   seen_count
+            FROM jobs
+        ''')
+        cursor.execute('DROP TABLE jobs')
+        cursor.execute('ALTER TABLE jobs_new RENAME TO jobs')
+        
+        cursor.execute('CREATE UNIQUE INDEX idx_email_link_hash ON jobs(email, link_hash)')
+        cursor.execute('CREATE INDEX idx_email_created ON jobs(email, created_at)')
+        cursor.execute('CREATE INDEX idx_created ON jobs(created_at)')
+    
+    def _migrate_normalized_dimensions(self, cursor: sqlite3.Cursor):
+        """Move subscriber emails, sources and search queries into lookup tables keyed by integer id."""
+        cursor.execute('''
+            CREATE TABLE subscribers (
+                id INTEGER PRIMARY KEY,
+                email TEXT NOT NULL UNIQUE
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE sources (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE queries (
+                id INTEGER PRIMARY KEY,
+                text TEXT NOT NULL UNIQUE
+            )
+        ''')
+        
+        cursor.execute('''
+            INSERT INTO subscribers (email)
+            SELECT email FROM jobs UNION SELECT email FROM delivered_links
+        ''')
+        cursor.execute('INSERT INTO sources (name) SELECT DISTINCT source FROM jobs WHERE source IS NOT NULL')
+        cursor.execute('INSERT INTO queries (text) SELECT DISTINCT search_query FROM jobs WHERE search_query IS NOT NULL')
+        
+        cursor.execute('''
+            CREATE TABLE jobs_new (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                subscriber_id INTEGER NOT NULL REFERENCES subscribers(id),
+                link_hash INTEGER NOT NULL,
+                title TEXT NOT NULL,
+                link TEXT NOT NULL,
+                source_id INTEGER REFERENCES sources(id),
+                query_id INTEGER REFERENCES queries(id),
+                created_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+                last_seen_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+                seen_count INTEGER NOT NULL DEFAULT 1
+            )
+        ''')
+        cursor.execute('''
+            INSERT INTO jobs_new (id, subscriber_id, link_hash, title, link, source_id, query_id,
+                                  created_at, last_seen_at, seen_count)
+            SELECT j.id, s.id, j.link_hash, j.title, j.link, src.id, q.id,
+                   j.created_at, j.last_seen_at, j.seen_count
+            FROM jobs j
+            JOIN subscribers s ON s.email = j.email
+            LEFT JOIN sources src ON src.name = j.source
+            LEFT JOIN queries q ON q.text = j.search_query
+        ''')
+        cursor.execute('DROP TABLE jobs')
+        cursor.execute('ALTER TABLE jobs_new RENAME TO jobs')
+        
+        cursor.execute('CREATE UNIQUE INDEX idx_subscriber_link_hash ON jobs(subscriber_id, link_hash)')
+        cursor.execute('CREATE INDEX idx_subscriber_created ON jobs(subscriber_id, created_at)')
+        cursor.execute('CREATE INDEX idx_created ON jobs(created_at)')
+        
+        cursor.execute('''
+            CREATE TABLE delivered_links_new (
+                subscriber_id INTEGER NOT NULL REFERENCES subscribers(id),
+                link_hash INTEGER NOT NULL,
+                delivered_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+                PRIMARY KEY (subscriber_id, link_hash)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('''
+            INSERT INTO delivered_links_new (subscriber_id, link_hash, delivered_at)
+            SELECT s.id, d.link_hash,
+                   COALESCE(CAST(strftime('%s', d.delivered_at) AS INTEGER), CAST(strftime('%s', 'now') AS INTEGER))
+            FROM delivered_links d
+            JOIN subscribers s ON s.email = d.email
+        ''')
+        cursor.execute('DROP TABLE delivered_links')
+        cursor.execute('ALTER TABLE delivered_links_new RENAME TO delivered_links')
+        
+        # Reads see the denormalized shape jobs had before
+        cursor.execute('''
+            CREATE VIEW job_log AS
+            SELECT j.id, j.title, j.link, s.email, src.name AS source, q.text AS search_query,
+                   j.link_hash, j.created_at, j.last_seen_at, j.seen_count
+            FROM jobs j
+            JOIN subscribers s ON s.id = j.subscriber_id
+            LEFT JOIN sources src ON src.id = j.source_id
+            LEFT JOIN queries q ON q.id = j.query_id
+        ''')
+    
+    def _migrate_job_stats(self, cursor: sqlite3.Cursor):
+        """Add job counters per subscriber, source and day, kept current by triggers."""
+        cursor.execute('''
+            CREATE TABLE job_stats (
+                dimension TEXT NOT NULL,
+                key INTEGER NOT NULL,
+                jobs INTEGER NOT NULL,
+                PRIMARY KEY (dimension, key)
+            ) WITHOUT ROWID
+        ''')
+        
+        # Jobs without a source count under key 0; days are UTC day numbers
+        cursor.execute('''
+            CREATE TRIGGER jobs_stats_insert AFTER INSERT ON jobs
+            BEGIN
+                INSERT INTO job_stats (dimension, key, jobs) VALUES
+                    ('total', 0, 1),
+                    ('subscriber', new.subscriber_id, 1),
+                    ('source', COALESCE(new.source_id, 0), 1),
+                    ('day', new.created_at / 86400, 1)
+                ON CONFLICT (dimension, key) DO UPDATE SET jobs = jobs + 1;
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER jobs_stats_delete AFTER DELETE ON jobs
+            BEGIN
+                UPDATE job_stats SET jobs = jobs - 1
+                WHERE (dimension, key) IN (VALUES
+                    ('total', 0),
+                    ('subscriber', old.subscriber_id),
+                    ('source', COALESCE(old.source_id, 0)),
+                    ('day', old.created_at / 86400));
+            END
+        ''')
+        
+        self._rebuild_job_stats(cursor)
+    
+    def _rebuild_job_stats(self, cursor: sqlite3.Cursor):
+        """Recount every job counter from the jobs table."""
+        cursor.execute('DELETE FROM job_stats')
+        cursor.execute('''
+            INSERT INTO job_stats (dimension, key, jobs)
+            SELECT 'total', 0, COUNT(*) FROM jobs
+            UNION ALL
+            SELECT 'subscriber', subscriber_id, COUNT(*) FROM jobs GROUP BY subscriber_id
+            UNION ALL
+            SELECT 'source', COALESCE(source_id, 0), COUNT(*) FROM jobs GROUP BY COALESCE(source_id, 0)
+            UNION ALL
+            SELECT 'day', created_at / 86400, COUNT(*) FROM jobs GROUP BY created_at / 86400
+        ''')
+    
+    def _migrate_full_text_search(self, cursor: sqlite3.Cursor):
+        """Add an FTS5 index over job titles, sources and search queries, kept in sync by triggers."""
+        # External content: the index stores only tokens and reads column values from job_log
+        cursor.execute('''
+            CREATE VIRTUAL TABLE jobs_fts USING fts5(
+                title, source, search_query,
+                content='job_log', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TRIGGER jobs_fts_insert AFTER INSERT ON jobs
+            BEGIN
+                INSERT INTO jobs_fts (rowid, title, source, search_query) VALUES (
+                    new.id, new.title,
+                    (SELECT name FROM sources WHERE id = new.source_id),
+                    (SELECT text FROM queries WHERE id = new.query_id)
+                );
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER jobs_fts_delete AFTER DELETE ON jobs
+            BEGIN
+                INSERT INTO jobs_fts (jobs_fts, rowid, title, source, search_query) VALUES (
+                    'delete', old.id, old.title,
+                    (SELECT name FROM sources WHERE id = old.source_id),
+                    (SELECT text FROM queries WHERE id = old.query_id)
+                );
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER jobs_fts_update AFTER UPDATE OF title, source_id, query_id ON jobs
+            BEGIN
+                INSERT INTO jobs_fts (jobs_fts, rowid, title, source, search_query) VALUES (
+                    'delete', old.id, old.title,
+                    (SELECT name FROM sources WHERE id = old.source_id),
+                    (SELECT text FROM queries WHERE id = old.query_id)
+                );
+                INSERT INTO jobs_fts (rowid, title, source, search_query) VALUES (
+                    new.id, new.title,
+                    (SELECT name FROM sources WHERE id = new.source_id),
+                    (SELECT text FROM queries WHERE id = new.query_id)
+                );
+            END
+        ''')
+        
+        cursor.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')")
+    
+    def _migrate_outbox(self, cursor: sqlite3.Cursor):
+        """Add the outbox of digest emails waiting to be sent, retried or given up on."""
+        cursor.execute('''
+            CREATE TABLE outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                recipient TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending'
+                    CHECK (status IN ('pending', 'sending', 'sent', 'failed')),
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at INTEGER NOT NULL,
+                created_at INTEGER NOT NULL,
+                sent_at INTEGER,
+                latency_ms INTEGER,
+                last_error TEXT
+            )
+        ''')
+        
+        # A row being sent keeps its lease expiry in next_attempt_at, so due
+        # retries and sends abandoned by a crashed worker are found the same way
+        cursor.execute('''
+            CREATE INDEX idx_outbox_due ON outbox (status, next_attempt_at)
+            WHERE status IN ('pending', 'sending')
+        ''')
+    
+    def _migrate_last_seen_index(self, cursor: sqlite3.Cursor):
+        """Index jobs by when a search last turned them up, which retention goes by."""
+        cursor.execute('CREATE INDEX idx_last_seen ON jobs(last_seen_at)')
+    
+    def _dimension_id(self, conn: sqlite3.Connection, table: str, column: str,
+                      value: Optional[str]) -> Optional[int]:
+        """Get the id of a subscriber, source or query row, adding it if needed.
+        
+        Lookup rows are never deleted, so ids are cached for the life of the
+        manager. New rows are committed straight away so a cached id never
+        points at a row from a rolled-back transaction.
+        """
+        if value is None:
+            return None
+        
+        key = (table, value)
+        row_id = self._dimension_ids.get(key)
+        if row_id is not None:
+            return row_id
+        
+        conn.execute(f'INSERT INTO {table} ({column}) VALUES (?) ON CONFLICT ({column}) DO NOTHING', (value,))
+        row_id = conn.execute(f'SELECT id FROM {table} WHERE {column} = ?', (value,)).fetchone()[0]
+        conn.commit()
+        
+        with self._dimension_lock:
+            self._dimension_ids[key] = row_id
+        return row_id
+    
+    def _subscriber_id(self, conn: sqlite3.Connection, email: str) -> int:
+        return self._dimension_id(conn, 'subscribers', 'email', email)
+    
+    def explain_query_plan(self, sql: str, params: tuple = ()) -> List[str]:
+        """Get SQLite's query plan for a statement, one line per step."""
+        with self._get_connection() as conn:
+            return [row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', params)]
+    
+    def save_job(self, title: str, link: str, email: str, source: str = "", search_query: str = "") -> Optional[bool]:
+        """Save a job listing, returning True if it is new, False if already saved, None on error."""
+        now = int(time.time())
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            conn = self._get_connection()
+            row = (title, link, self._subscriber_id(conn, email),
+                   self._dimension_id(conn, 'sources', 'name', source),
+                   self._dimension_id(conn, 'queries', 'text', search_query), link_hash(link), now, now)
+            
+            with conn:
                 cursor = conn.cursor()
                 
-                # Create jobs table
                 cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS jobs (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        title TEXT NOT NULL,
-                        link TEXT NOT NULL,
-                        email TEXT NOT NULL,
-                        source TEXT,
-                        search_query TEXT,
-                        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-                    )
-                ''')
+                    INSERT INTO jobs (title, link, subscriber_id, source_id, query_id, link_hash,
+                                      created_at, last_seen_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (subscriber_id, link_hash) DO UPDATE SET
+                        last_seen_at = excluded.last_seen_at,
+                        seen_count = seen_count + 1
+                    RETURNING seen_count
+                ''', row)
                 
-                # Create index for better query performance
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_email ON jobs(email)')
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_timestamp ON jobs(timestamp)')
+                return cursor.fetchone()[0] == 1
                 
-                conn.commit()
+        except sqlite3.Error as e:
+            print(f"Error saving job: {e}")
+            return None
+    
+    def save_jobs(self, jobs: List[Dict], email: str, search_query: str = "") -> Dict:
+        """Save a batch of job listings in a single transaction.
+        
+        Returns counts of rows inserted as new, rows that already existed
+        and were updated, and jobs skipped as invalid or repeated in the batch.
+        """
+        try:
+            conn = self._get_connection()
+            batch = self._prepare_jobs(conn, jobs, email, search_query)
+            
+            with conn:
+                return self._write_jobs(conn, batch)
                 
         except sqlite3.Error as e:
-            print(f"Database initialization error: {e}")
-            raise
+            print(f"Error saving jobs: {e}")
+            return {'inserted': 0, 'updated': 0, 'skipped': len(jobs)}
     
-    def save_job(self, title: str, link: str, email: str, source: str = "", search_query: str = "") -> bool:
-        """Save a job listing to the database."""
+    def _prepare_jobs(self, conn: sqlite3.Connection, jobs: List[Dict], email: str,
+                      search_query: str) -> Dict:
+        """Resolve lookup ids and build the upsert rows for a batch of jobs."""
+        now = int(time.time())
+        valid = {}
+        for job in jobs:
+            if job.get('title') and job.get('link'):
+                valid.setdefault(link_hash(job['link']), job)
+        
+        batch = {'subscriber_id': None, 'rows': {}, 'skipped': len(jobs) - len(valid)}
+        if not valid:
+            return batch
+        
+        batch['subscriber_id'] = subscriber_id = self._subscriber_id(conn, email)
+        query_id = self._dimension_id(conn, 'queries', 'text', search_query)
+        batch['rows'] = {
+            job_hash: (job['title'], job['link'], subscriber_id,
+                       self._dimension_id(conn, 'sources', 'name', job.get('source', '')),
+                       query_id, job_hash, now, now)
+            for job_hash, job in valid.items()
+        }
+        return batch
+    
+    def _write_jobs(self, conn: sqlite3.Connection, batch: Dict) -> Dict:
+        """Upsert prepared job rows inside the caller's transaction and count the new ones."""
+        rows = batch['rows']
+        if not rows:
+            return {'inserted': 0, 'updated': 0, 'skipped': batch['skipped']}
+        
+        cursor = conn.cursor()
+        cursor.executemany('''
+            INSERT INTO jobs (title, link, subscriber_id, source_id, query_id, link_hash,
+                              created_at, last_seen_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (subscriber_id, link_hash) DO UPDATE SET
+                last_seen_at = excluded.last_seen_at,
+                seen_count = seen_count + 1
+        ''', list(rows.values()))
+        
+        # Existing rows were just incremented, so a count of one means new
+        inserted = 0
+        for chunk in _chunks(list(rows)):
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f'''
+                SELECT COUNT(*) FROM jobs
+                WHERE subscriber_id = ? AND link_hash IN ({placeholders}) AND seen_count = 1
+            ''', [batch['subscriber_id']] + chunk)
+            inserted += cursor.fetchone()[0]
+        
+        return {'inserted': inserted, 'updated': len(rows) - inserted, 'skipped': batch['skipped']}
+    
+    def filter_new_jobs(self, email: str, jobs: List[Dict]) -> List[Dict]:
+        """Drop jobs whose canonical link was already delivered to this email."""
+        if not jobs:
+            return []
+        
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
-                cursor.execute('''
-                    INSERT INTO jobs (title, link, email, source, search_query)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (title, link, email, source, search_query))
+                hashes = [link_hash(job['link']) for job in jobs]
+                delivered = set()
+                
+                for chunk in _chunks(hashes):
+                    placeholders = ','.join('?' * len(chunk))
+                    cursor.execute(DELIVERED_HASHES_SQL.format(placeholders=placeholders), [email] + chunk)
+                    delivered.update(row[0] for row in cursor.fetchall())
+                
+                new_jobs = []
+                for job, job_hash in zip(jobs, hashes):
+                    if job_hash not in delivered:
+                        new_jobs.append(job)
+                        delivered.add(job_hash)
+                
+                return new_jobs
+                
+        except sqlite3.Error as e:
+            print(f"Error filtering delivered jobs: {e}")
+            return jobs
+    
+    def mark_jobs_delivered(self, email: str, jobs: List[Dict]) -> bool:
+        """Record jobs as delivered to this email so later runs skip them."""
+        try:
+            conn = self._get_connection()
+            delivered = self._prepare_delivered(conn, email, jobs)
+            
+            with conn:
+                return self._write_delivered(conn, delivered)
+                
+        except sqlite3.Error as e:
+            print(f"Error marking jobs delivered: {e}")
+            return False
+    
+    def _prepare_delivered(self, conn: sqlite3.Connection, email: str, jobs: List[Dict]) -> List[Tuple]:
+        subscriber_id = self._subscriber_id(conn, email)
+        return [(subscriber_id, link_hash(job['link'])) for job in jobs]
+    
+    def _write_delivered(self, conn: sqlite3.Connection, delivered: List[Tuple]) -> bool:
+        conn.executemany('''
+            INSERT OR IGNORE INTO delivered_links (subscriber_id, link_hash)
+            VALUES (?, ?)
+        ''', delivered)
+        return True
+    
+    def write_batch(self, writes: List[Tuple[str, tuple]]) -> List:
+        """Apply several save_jobs / mark_jobs_delivered calls in one transaction.
+        
+        ``writes`` holds (method name, args) pairs; the result of each call,
+        or the exception it raised, is returned in the same order. If the
+        shared transaction fails, each call is retried in its own transaction
+        so one bad write does not take the rest of the batch with it.
+        """
+        steps = {
+            'save_jobs': (self._prepare_jobs, self._write_jobs),
+            'mark_jobs_delivered': (self._prepare_delivered, self._write_delivered)
+        }
+        conn = self._get_connection()
+        
+        # Lookup ids are resolved, and committed, before the batch transaction opens
+        prepared = []
+        for name, args in writes:
+            try:
+                prepare, write = steps[name]
+                prepared.append((write, prepare(conn, *args)))
+            except (KeyError, TypeError, sqlite3.Error) as e:
+                prepared.append(e)
+        
+        try:
+            with conn:
+                return [step if isinstance(step, Exception) else step[0](conn, step[1])
+                        for step in prepared]
+                
+        except sqlite3.Error:
+            results = []
+            for step in prepared:
+                if isinstance(step, Exception):
+                    results.append(step)
+                    continue
+                try:
+                    with conn:
+                        results.append(step[0](conn, step[1]))
+                except sqlite3.Error as e:
+                    results.append(e)
+            return results
+    
+    def enqueue_email(self, recipient: str, jobs: List[Dict], job_role: str, location: str,
+                      hold_seconds: int = 0) -> Optional[int]:
+        """Add a job digest to the outbox, returning its id or None on error.
+        
+        With ``hold_seconds`` the email waits that long for other searches'
+        results for the same recipient. A digest enqueued while an earlier
+        one is still held is merged into it as another section, without the
+        jobs whose links it already carries, and the held email goes out no
+        later than this one would have.
+        """
+        now = int(time.time())
+        section = {'job_role': job_role, 'location': location, 'jobs': jobs}
+        try:
+            conn = self._get_connection()
+            
+            # Take the write lock first so concurrent producers merge one at a time
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                held = conn.execute('''
+                    SELECT id, payload, next_attempt_at FROM outbox
+                    WHERE status = 'pending' AND next_attempt_at > ? AND attempts = 0 AND recipient = ?
+                    ORDER BY id DESC
+                    LIMIT 1
+                ''', (now, recipient)).fetchone()
                 
+                if held is None:
+                    sections = self._merge_section([], section)
+                    email_id = conn.execute('''
+                        INSERT INTO outbox (recipient, payload, next_attempt_at, created_at)
+                        VALUES (?, ?, ?, ?)
+                    ''', (recipient, json.dumps({'sections': sections}), now + hold_seconds, now)).lastrowid
+                else:
+                    email_id, payload, send_at = held
+                    sections = self._merge_section(self._outbox_sections(payload), section)
+                    conn.execute('''
+                        UPDATE outbox SET payload = ?, next_attempt_at = ? WHERE id = ?
+                    ''', (json.dumps({'sections': sections}), min(send_at, now + hold_seconds), email_id))
+                    
                 conn.commit()
+                return email_id
+                
+            except BaseException:
+                conn.rollback()
+                raise
+                
+        except sqlite3.Error as e:
+            print(f"Error queueing email: {e}")
+            return None
+    
+    @staticmethod
+    def _outbox_sections(payload: str) -> List[Dict]:
+        """Get the sections of an outbox payload, one per search it covers."""
+        payload = json.loads(payload)
+        return payload['sections'] if 'sections' in payload else [payload]
+    
+    @staticmethod
+    def _merge_section(sections: List[Dict], section: Dict) -> List[Dict]:
+        """Add a search's results to a digest's sections, dropping jobs whose links are already there.
+        
+        Results for a search already in the digest extend its section. A
+        search whose jobs were all duplicates adds nothing, while one that
+        found no jobs keeps its section so the recipient hears about it.
+        """
+        seen = {link_hash(job['link']) for existing in sections for job in existing['jobs']}
+        jobs = []
+        for job in section['jobs']:
+            job_hash = link_hash(job['link'])
+            if job_hash not in seen:
+                seen.add(job_hash)
+                jobs.append(job)
+                
+        for existing in sections:
+            if (existing['job_role'], existing['location']) == (section['job_role'], section['location']):
+                existing['jobs'].extend(jobs)
+                return sections
+                
+        if jobs or not section['jobs']:
+            sections.append({'job_role': section['job_role'], 'location': section['location'], 'jobs': jobs})
+        return sections
+    
+    def claim_emails(self, limit: int = 1, lease_seconds: int = 300, max_attempts: Optional[int] = None) -> List[Dict]:
+        """Lease up to ``limit`` due outbox emails to the caller and count the attempt.
+        
+        Claimed rows are marked 'sending' until ``lease_seconds`` from now.
+        If the claimant dies without reporting back, the lease runs out and
+        the email is claimed again, so nothing is lost to a crash. An email
+        whose lease runs out after ``max_attempts`` claims is marked failed
+        instead, so one that hangs or crashes every sender is not retried forever.
+        """
+        now = int(time.time())
+        try:
+            with self._get_connection() as conn:
+                if max_attempts is not None:
+                    conn.execute('''
+                        UPDATE outbox SET status = 'failed',
+                                          last_error = 'Lease ran out on attempt ' || attempts || ': '
+                                                       || COALESCE(last_error, 'no error reported')
+                        WHERE status = 'sending' AND next_attempt_at <= ? AND attempts >= ?
+                    ''', (now, max_attempts))
+                    
+                rows = conn.execute('''
+                    UPDATE outbox SET status = 'sending', attempts = attempts + 1, next_attempt_at = ?
+                    WHERE id IN (
+                        SELECT id FROM outbox
+                        WHERE status IN ('pending', 'sending') AND next_attempt_at <= ?
+                              AND (? IS NULL OR attempts < ?)
+                        ORDER BY next_attempt_at
+                        LIMIT ?
+                    )
+                    RETURNING id, recipient, payload, attempts
+                ''', (now + lease_seconds, now, max_attempts, max_attempts, limit)).fetchall()
+                
+                return [{'id': row[0], 'recipient': row[1], 'sections': self._outbox_sections(row[2]),
+                         'attempts': row[3]} for row in rows]
+                
+        except sqlite3.Error as e:
+            print(f"Error claiming emails: {e}")
+            return []
+    
+    def complete_email(self, email_id: int, latency_ms: int) -> bool:
+        """Record an outbox email as sent."""
+        try:
+            with self._get_connection() as conn:
+                conn.execute('''
+                    UPDATE outbox SET status = 'sent', sent_at = ?, latency_ms = ?, last_error = NULL
+                    WHERE id = ?
+                ''', (int(time.time()), latency_ms, email_id))
                 return True
                 
         except sqlite3.Error as e:
-            print(f"Error saving job: {e}")
+            print(f"Error completing email: {e}")
             return False
     
+    def fail_email(self, email_id: int, error: str, latency_ms: int, retry_at: Optional[int] = None) -> bool:
+        """Record a failed send, to be retried at ``retry_at`` or, without one, given up on."""
+        try:
+            with self._get_connection() as conn:
+                conn.execute('''
+                    UPDATE outbox SET status = ?, next_attempt_at = COALESCE(?, next_attempt_at),
+                                      latency_ms = ?, last_error = ?
+                    WHERE id = ?
+                ''', ('pending' if retry_at is not None else 'failed', retry_at, latency_ms, error, email_id))
+                return True
+                
+        except sqlite3.Error as e:
+            print(f"Error recording email failure: {e}")
+            return False
+    
+    def get_outbox_stats(self) -> Dict:
+        """Get the number of outbox emails in each status and the average send latency."""
+        stats = {'pending': 0, 'sending': 0, 'sent': 0, 'failed': 0, 'avg_latency_ms': None}
+        try:
+            with self._get_connection() as conn:
+                for status, count, latency in conn.execute('''
+                    SELECT status, COUNT(*), AVG(latency_ms) FROM outbox GROUP BY status
+                '''):
+                    stats[status] = count
+                    if status == 'sent':
+                        stats['avg_latency_ms'] = latency
+                return stats
+                
+        except sqlite3.Error as e:
+            print(f"Error getting outbox stats: {e}")
+            return stats
+    
     def get_job_logs(self, email: Optional[str] = None, limit: int = 1000) -> List[Dict]:
         """Retrieve job logs from the database."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
                 if email:
-                    cursor.execute('''
-                        SELECT title, link, email, source, search_query, timestamp
-                        FROM jobs
+                    cursor.execute(f'''
+                        SELECT title, link, email, source, search_query, {TIMESTAMP_COLUMN}
+                        FROM job_log
                         WHERE email = ?
-                        ORDER BY timestamp DESC
+                        ORDER BY created_at DESC
                         LIMIT ?
                     ''', (email, limit))
                 else:
-                    cursor.execute('''
-                        SELECT title, link, email, source, search_query, timestamp
-                        FROM jobs
-                        ORDER BY timestamp DESC
+                    cursor.execute(f'''
+                        SELECT title, link, email, source, search_query, {TIMESTAMP_COLUMN}
+                        FROM job_log
+                        ORDER BY created_at DESC
                         LIMIT ?
                     ''', (limit,))
                 
@@ -97,43 +915,330 @@ class DatabaseManager:
             print(f"Error retrieving job logs: {e}")
             return []
     
+    def job_logs_page_query(self, email: Optional[str] = None, page_size: int = 50,
+                            cursor: Optional[Tuple] = None, start=None, end=None) -> Tuple[str, List]:
+        """Build the SQL and parameters for one page of job logs."""
+        conditions = []
+        params = []
+        
+        if email:
+            conditions.append('email = ?')
+            params.append(email)
+        if start is not None:
+            conditions.append('created_at >= ?')
+            params.append(to_epoch(start))
+        if end is not None:
+            conditions.append('created_at < ?')
+            params.append(to_epoch(end))
+        if cursor:
+            conditions.append('(created_at, id) < (?, ?)')
+            params.extend(cursor)
+        
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        
+        sql = f'''
+            SELECT id, title, link, email, source, search_query, created_at, {TIMESTAMP_COLUMN}
+            FROM job_log
+            {where}
+            ORDER BY created_at DESC, id DESC
+            LIMIT ?
+        '''
+        return sql, params + [page_size + 1]
+    
+    def get_job_logs_page(self, email: Optional[str] = None, page_size: int = 50,
+                          cursor: Optional[Tuple] = None, start=None, end=None) -> Dict:
+        """Fetch one page of job logs, newest first, continuing after a keyset cursor.
+        
+        ``cursor`` is the ``next_cursor`` of the previous page. ``start`` and
+        ``end`` bound when the job was saved, with ``end`` exclusive; each may
+        be a date, datetime, 'YYYY-MM-DD[ HH:MM:SS]' string or epoch seconds,
+        with naive values read as UTC. Each page is a single index range scan,
+        so its cost does not depend on how deep into the history it is.
+        """
+        sql, params = self.job_logs_page_query(email, page_size, cursor, start, end)
+        
+        try:
+            with self._get_connection() as conn:
+                rows = conn.execute(sql, params).fetchall()
+                
+        except sqlite3.Error as e:
+            print(f"Error retrieving job logs page: {e}")
+            return {'jobs': [], 'next_cursor': None}
+        
+        # The extra row only tells us whether another page follows
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        
+        jobs = [{
+            'title': row[1],
+            'link': row[2],
+            'email': row[3],
+            'source': row[4],
+            'search_query': row[5],
+            'timestamp': row[7]
+        } for row in rows]
+        
+        next_cursor = (rows[-1][6], rows[-1][0]) if has_more else None
+        return {'jobs': jobs, 'next_cursor': next_cursor}
+    
+    def search_jobs_history(self, text: str, email: Optional[str] = None, limit: int = 50) -> List[Dict]:
+        """Search saved jobs by keyword, best matches first.
+        
+        Every word in ``text`` must appear in the title, source or search
+        query, matched as a prefix. Title matches rank highest.
+        """
+        terms = [f'"{word.replace(chr(34), chr(34) * 2)}"*' for word in text.split()]
+        if not terms:
+            return []
+        
+        conditions = ['jobs_fts MATCH ?']
+        params = [' '.join(terms)]
+        if email:
+            conditions.append('l.email = ?')
+            params.append(email)
+        
+        try:
+            with self._get_connection() as conn:
+                rows = conn.execute(f'''
+                    SELECT l.title, l.link, l.email, l.source, l.search_query,
+                           strftime('%Y-%m-%d %H:%M:%S', l.created_at, 'unixepoch')
+                    FROM jobs_fts
+                    JOIN job_log l ON l.id = jobs_fts.rowid
+                    WHERE {' AND '.join(conditions)}
+                    ORDER BY bm25(jobs_fts, 10.0, 1.0, 2.0)
+                    LIMIT ?
+                ''', params + [limit]).fetchall()
+                
+        except sqlite3.Error as e:
+            print(f"Error searching job history: {e}")
+            return []
+        
+        return [{
+            'title': row[0],
+            'link': row[1],
+            'email': row[2],
+            'source': row[3],
+            'search_query': row[4],
+            'timestamp': row[5]
+        } for row in rows]
+    
+    def iter_job_logs(self, email: Optional[str] = None, page_size: int = 500,
+                      start=None, end=None) -> Iterator[List[Dict]]:
+        """Stream job logs page by page, holding only one page in memory."""
+        cursor = None
+        while True:
+            page = self.get_job_logs_page(email, page_size, cursor, start, end)
+            if page['jobs']:
+                yield page['jobs']
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+    
+    def get_job_log_summary(self) -> Dict:
+        """Get the total job count with the number of distinct sources and emails.
+        
+        Read from the job_stats counters, so the cost does not grow with history.
+        """
+        try:
+            with self._get_connection() as conn:
+                total, sources, emails = conn.execute('''
+                    SELECT
+                        (SELECT COALESCE(SUM(jobs), 0) FROM job_stats WHERE dimension = 'total'),
+                        (SELECT COUNT(*) FROM job_stats WHERE dimension = 'source' AND key > 0 AND jobs > 0),
+                        (SELECT COUNT(*) FROM job_stats WHERE dimension = 'subscriber' AND jobs > 0)
+                ''').fetchone()
+                return {'total': total, 'sources': sources, 'emails': emails}
+                
+        except sqlite3.Error as e:
+            print(f"Error summarizing job logs: {e}")
+            return {'total': 0, 'sources': 0, 'emails': 0}
+    
+    def get_jobs_per_email(self) -> Dict[str, int]:
+        """Get the number of saved jobs for each email address."""
+        return self._get_job_counts('''
+            SELECT s.email, st.jobs FROM job_stats st
+            JOIN subscribers s ON s.id = st.key
+            WHERE st.dimension = 'subscriber' AND st.jobs > 0
+            ORDER BY s.email
+        ''')
+    
+    def get_jobs_per_source(self) -> Dict[str, int]:
+        """Get the number of saved jobs for each source, most common first."""
+        return self._get_job_counts('''
+            SELECT COALESCE(src.name, ''), st.jobs FROM job_stats st
+            LEFT JOIN sources src ON src.id = st.key
+            WHERE st.dimension = 'source' AND st.jobs > 0
+            ORDER BY st.jobs DESC
+        ''')
+    
+    def get_jobs_per_day(self, days: int = 30) -> Dict[str, int]:
+        """Get the number of jobs saved on each of the last N days (UTC), keyed by 'YYYY-MM-DD'."""
+        first_day = int(time.time()) // 86400 - days + 1
+        return self._get_job_counts('''
+            SELECT date(key * 86400, 'unixepoch'), jobs FROM job_stats
+            WHERE dimension = 'day' AND key >= ? AND jobs > 0
+            ORDER BY key
+        ''', (first_day,))
+    
+    def _get_job_counts(self, sql: str, params: tuple = ()) -> Dict[str, int]:
+        try:
+            with self._get_connection() as conn:
+                return dict(conn.execute(sql, params).fetchall())
+                
+        except sqlite3.Error as e:
+            print(f"Error retrieving job counts: {e}")
+            return {}
+    
+    def get_emails(self) -> List[str]:
+        """Get every email address that has saved jobs."""
+        return list(self.get_jobs_per_email())
+    
     def get_total_jobs_count(self) -> int:
         """Get the total number of jobs in the database."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute('SELECT COUNT(*) FROM jobs')
+                cursor.execute("SELECT COALESCE(SUM(jobs), 0) FROM job_stats WHERE dimension = 'total'")
                 return cursor.fetchone()[0]
                 
         except sqlite3.Error as e:
             print(f"Error getting job count: {e}")
             return 0
     
-    def clear_all_data(self) -> bool:
-        """Clear all job data from the database."""
+    def clear_all_data(self, chunk_size: int = 1000) -> bool:
+        """Clear all job data from the database, deleting in short transactions."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            conn = self._get_connection()
+            self._delete_jobs_in_chunks(conn, '1', (), chunk_size)
+            
+            with conn:
                 cursor = conn.cursor()
-                cursor.execute('DELETE FROM jobs')
-                conn.commit()
-                return True
+                cursor.execute('DELETE FROM delivered_links')
+                cursor.execute('DELETE FROM job_stats')
+                cursor.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('delete-all')")
+            self._reclaim_space(conn)
+            return True
                 
         except sqlite3.Error as e:
             print(f"Error clearing data: {e}")
             return False
     
+    def purge_old_jobs(self, max_age_days: Optional[int] = None, archive_dir: Optional[str] = None,
+                       chunk_size: int = 500, pause: float = 0.05) -> Dict:
+        """Archive or delete jobs no search has turned up for more than max_age_days.
+        
+        Age goes by last_seen_at, so a posting first saved long ago that
+        searches still find is kept.
+        
+        Rows go in chunks of ``chunk_size``, each in its own short transaction
+        followed by an incremental vacuum and a ``pause`` so other writers get
+        the lock in between. With an archive directory, rows are first copied
+        into one SQLite file per month (jobs-YYYY-MM.db), attached only while
+        it is written; an empty ``archive_dir`` deletes them outright.
+        Defaults come from JOBHUNTER_RETENTION_DAYS and JOBHUNTER_ARCHIVE_DIR.
+        Sent and failed outbox emails older than the cutoff are deleted too.
+        """
+        if max_age_days is None:
+            max_age_days = int(os.getenv("JOBHUNTER_RETENTION_DAYS", DEFAULT_RETENTION_DAYS))
+        if archive_dir is None:
+            default_dir = os.path.join(os.path.dirname(os.path.abspath(self.db_path)), 'archive')
+            archive_dir = os.getenv("JOBHUNTER_ARCHIVE_DIR", default_dir)
+        
+        cutoff = int(time.time()) - max_age_days * 86400
+        counts = {'archived': 0, 'deleted': 0}
+        
+        try:
+            conn = self._get_connection()
+            
+            with conn:
+                conn.execute("DELETE FROM outbox WHERE status IN ('sent', 'failed') AND created_at < ?", (cutoff,))
+            
+            if not archive_dir:
+                counts['deleted'] = self._delete_jobs_in_chunks(conn, 'last_seen_at < ?', (cutoff,),
+                                                                chunk_size, pause)
+                return counts
+            
+            while True:
+                rows = conn.execute(STALE_JOBS_SQL, (cutoff, chunk_size)).fetchall()
+                
+                if not rows:
+                    break
+                
+                by_month = {}
+                for row_id, created_at in rows:
+                    month = datetime.fromtimestamp(created_at, timezone.utc).strftime('%Y-%m')
+                    by_month.setdefault(month, []).append(row_id)
+                
+                for month, ids in by_month.items():
+                    path = os.path.join(archive_dir, f"jobs-{month}.db")
+                    counts['archived'] += self._archive_jobs(conn, path, ids)
+                counts['deleted'] += len(rows)
+                
+                self._reclaim_space(conn)
+                time.sleep(pause)
+            
+            return counts
+            
+        except (sqlite3.Error, OSError) as e:
+            print(f"Error purging old jobs: {e}")
+            return counts
+    
+    def _delete_jobs_in_chunks(self, conn: sqlite3.Connection, where: str, params: tuple,
+                               chunk_size: int, pause: float = 0.0) -> int:
+        """Delete matching jobs a chunk per transaction, returning how many were deleted."""
+        deleted = 0
+        while True:
+            with conn:
+                count = conn.execute(f'''
+                    DELETE FROM jobs WHERE id IN (
+                        SELECT id FROM jobs WHERE {where} LIMIT ?
+                    )
+                ''', params + (chunk_size,)).rowcount
+            
+            if not count:
+                return deleted
+            
+            deleted += count
+            self._reclaim_space(conn)
+            time.sleep(pause)
+    
+    def _reclaim_space(self, conn: sqlite3.Connection):
+        """Fold deleted rows out of the full-text index and return free pages to the filesystem."""
+        with conn:
+            conn.execute("INSERT INTO jobs_fts (jobs_fts, rank) VALUES ('merge', 500)")
+        # executescript steps the pragma to completion; execute() frees a single page
+        conn.executescript('PRAGMA incremental_vacuum')
+    
+    def _archive_jobs(self, conn: sqlite3.Connection, path: str, ids: List[int]) -> int:
+        """Move jobs into an archive file in one transaction, returning how many were copied."""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        placeholders = ','.join('?' * len(ids))
+        
+        conn.execute('ATTACH DATABASE ? AS archive', (path,))
+        try:
+            conn.execute(ARCHIVE_TABLE)
+            with conn:
+                # Copies are idempotent, so a chunk retried after a crash is not duplicated
+                archived = conn.execute(f'''
+                    INSERT OR IGNORE INTO archive.jobs (title, link, email, source, search_query, link_hash,
+                                                        created_at, last_seen_at, seen_count)
+                    SELECT title, link, email, source, search_query, link_hash,
+                           created_at, last_seen_at, seen_count
+                    FROM main.job_log WHERE id IN ({placeholders})
+                ''', ids).rowcount
+                conn.execute(f'DELETE FROM main.jobs WHERE id IN ({placeholders})', ids)
+        finally:
+            conn.execute('DETACH DATABASE archive')
+        
+        return archived
+    
     def get_recent_jobs(self, email: str, hours: int = 24) -> List[Dict]:
         """Get recent jobs for a specific email within the last N hours."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
-                cursor.execute('''
-                    SELECT title, link, email, source, search_query, timestamp
-                    FROM jobs
-                    WHERE email = ? AND datetime(timestamp) > datetime('now', '-{} hours')
-                    ORDER BY timestamp DESC
-                '''.format(hours), (email,))
+                cursor.execute(RECENT_JOBS_SQL, (email, int(time.time()) - hours * 3600))
                 
                 rows = cursor.fetchall()
                 
@@ -0,0 +1,147 @@
+import atexit
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+from database import DatabaseManager
+
+
+class _Write:
+    """A queued DatabaseManager write and the future its caller holds."""
+
+    def __init__(self, name: str, args: tuple):
+        self.name = name
+        self.args = args
+        self.future = Future()
+
+
+class DatabaseWriter:
+    """Single background thread applying queued database writes in batches.
+
+    Callers enqueue writes and get a Future back straight away; ignoring it
+    gives fire-and-forget semantics. The writer takes up to ``batch_size``
+    queued writes, or whatever arrives within ``max_delay`` seconds of the
+    first, and applies them in one transaction, so SQLite sees one writer
+    committing batches instead of many threads contending for the lock.
+    Once ``max_pending`` writes are waiting, callers block (or get
+    ``queue.Full`` after ``timeout``) until the writer catches up. Writes
+    submitted after ``close`` get a future failed with RuntimeError.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, max_pending: int = 10000,
+                 batch_size: int = 200, max_delay: float = 0.05):
+        self.db_manager = db_manager
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.counters = {'writes': 0, 'batches': 0, 'errors': 0}
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def save_jobs(self, jobs: List[Dict], email: str, search_query: str = "",
+                  timeout: Optional[float] = None) -> Future:
+        """Queue DatabaseManager.save_jobs; the future resolves to its counts."""
+        return self._submit('save_jobs', (jobs, email, search_query), timeout)
+
+    def mark_jobs_delivered(self, email: str, jobs: List[Dict], timeout: Optional[float] = None) -> Future:
+        """Queue DatabaseManager.mark_jobs_delivered; the future resolves to True."""
+        return self._submit('mark_jobs_delivered', (email, jobs), timeout)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every write queued before this call is committed."""
+        try:
+            self._submit('flush', (), timeout).result(timeout)
+            return True
+        except Exception:
+            return False
+
+    def close(self, timeout: Optional[float] = None):
+        """Write out everything still queued and stop the writer thread."""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join(timeout)
+
+    def pending(self) -> int:
+        """Get the number of writes waiting in the queue."""
+        return self._queue.qsize()
+
+    def stats(self) -> Dict:
+        """Get write/batch/error counters and the current queue depth."""
+        stats = dict(self.counters)
+        stats['pending'] = self.pending()
+        return stats
+
+    def _submit(self, name: str, args: tuple, timeout: Optional[float]) -> Future:
+        write = _Write(name, args)
+        # Checked and queued under close's lock, so no write can land behind the stop signal
+        with self._close_lock:
+            if self._closed:
+                write.future.set_exception(RuntimeError("DatabaseWriter is closed"))
+            else:
+                self._queue.put(write, timeout=timeout)
+        return write.future
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            write = self._queue.get()
+            if write is None:
+                break
+
+            # Gather whatever else is queued, waiting at most max_delay for more
+            batch = [write]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.batch_size:
+                try:
+                    write = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if write is None:
+                    stopping = True
+                    break
+                batch.append(write)
+
+            self._apply(batch)
+
+        # Drain anything queued behind the stop signal before exiting
+        leftover = []
+        while True:
+            try:
+                write = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if write is not None:
+                leftover.append(write)
+        if leftover:
+            self._apply(leftover)
+
+    def _apply(self, batch: List[_Write]):
+        writes = [write for write in batch if write.name != 'flush']
+
+        try:
+            results = self.db_manager.write_batch([(write.name, write.args) for write in writes])
+        except Exception as e:
+            results = [e] * len(writes)
+
+        for write, result in zip(writes, results):
+            if isinstance(result, Exception):
+                self.counters['errors'] += 1
+                print(f"Error in queued {write.name}: {result}")
+                write.future.set_exception(result)
+            else:
+                write.future.set_result(result)
+
+        self.counters['writes'] += len(writes)
+        self.counters['batches'] += 1
+
+        # Flushes complete only once every write queued ahead of them has
+        for write in batch:
+            if write.name == 'flush':
+                write.future.set_result(True)
@@ -0,0 +1,206 @@
+import re
+from datetime import datetime
+from html import escape
+from typing import Dict, List, Optional, Tuple
+
+# Layout of the HTML digest. Slots are {{name}}; everything else is copied verbatim.
+HTML_HEADER = """
+        <html>
+        <head>
+            <style>
+                body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+                .header { background-color: #f4f4f4; padding: 20px; border-radius: 5px; margin-bottom: 20px; }
+                .job-item { border: 1px solid #ddd; border-radius: 5px; padding: 15px; margin-bottom: 15px; }
+                .job-title { font-size: 18px; font-weight: bold; color: #2c3e50; margin-bottom: 10px; }
+                .job-link { color: #3498db; text-decoration: none; }
+                .job-link:hover { text-decoration: underline; }
+                .job-source { color: #7f8c8d; font-size: 14px; }
+                .footer { margin-top: 30px; padding-top: 20px; border-top: 1px solid #ddd; text-align: center; color: #7f8c8d; }
+            </style>
+        </head>
+        <body>
+            <div class="header">
+                <h2>🤖 Your Daily Job Updates</h2>
+                <p><strong>Search:</strong> {{job_role}} in {{location}}</p>
+                <p><strong>Date:</strong> {{date}}</p>
+                <p><strong>Jobs Found:</strong> {{count}}</p>
+            </div>
+        """
+
+HTML_LIST_HEADER = "<h3>📋 Job Listings:</h3>"
+
+# A digest coalescing several saved searches lists them all up top and gives each a section
+HTML_SECTIONS_HEADER = HTML_HEADER.replace(
+    "<p><strong>Search:</strong> {{job_role}} in {{location}}</p>",
+    "<p><strong>Searches:</strong> {{searches}}</p>")
+
+HTML_SECTION_HEADER = "<h3>📋 {{job_role}} in {{location}} ({{count}})</h3>"
+
+HTML_JOB = """
+                <div class="job-item">
+                    <div class="job-title">{{number}}. {{title}}</div>
+                    <p><a href="{{link}}" class="job-link" target="_blank">🔗 View Job Application</a></p>
+                    <p class="job-source">📍 Source: {{source}}</p>
+                </div>
+                """
+
+HTML_EMPTY = """
+            <div class="job-item">
+                <p>No new job listings found for your search criteria today.</p>
+                <p>Try adjusting your search parameters or check back tomorrow!</p>
+            </div>
+            """
+
+HTML_FOOTER = """
+            <div class="footer">
+                <p>Sent by your AI Job Agent 🤖</p>
+                <p>This is an automated email. Please do not reply.</p>
+            </div>
+        </body>
+        </html>
+        """
+
+TEXT_HEADER = """Your Daily Job Updates
+Search: {{job_role}} in {{location}}
+Date: {{date}}
+Jobs Found: {{count}}
+
+"""
+
+TEXT_LIST_HEADER = "Job Listings:\n\n"
+
+TEXT_SECTIONS_HEADER = TEXT_HEADER.replace("Search: {{job_role}} in {{location}}", "Searches: {{searches}}")
+
+TEXT_SECTION_HEADER = "== {{job_role}} in {{location}} ({{count}}) ==\n\n"
+
+TEXT_JOB = """{{number}}. {{title}}
+   {{link}}
+   Source: {{source}}
+
+"""
+
+TEXT_EMPTY = """No new job listings found for your search criteria today.
+Try adjusting your search parameters or check back tomorrow!
+
+"""
+
+TEXT_FOOTER = """--
+Sent by your AI Job Agent
+This is an automated email. Please do not reply.
+"""
+
+SLOT_RE = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+
+
+class Template:
+    """A layout split once into literal text and slots.
+
+    The source is turned into a ``str.format`` pattern whose fields are
+    the slots' positions, with literal braces doubled, so rendering does
+    one string build and no parsing. ``format`` takes the slot values
+    positionally, in the order the slots first appear.
+    """
+
+    def __init__(self, source: str):
+        fragments = []
+        self.slots: List[str] = []
+        position = 0
+        for match in SLOT_RE.finditer(source):
+            fragments.append(source[position:match.start()].replace('{', '{{').replace('}', '}}'))
+            if match.group(1) not in self.slots:
+                self.slots.append(match.group(1))
+            fragments.append('{%d}' % self.slots.index(match.group(1)))
+            position = match.end()
+        fragments.append(source[position:].replace('{', '{{').replace('}', '}}'))
+        self.pattern = ''.join(fragments)
+        self.format = self.pattern.format
+
+    def render(self, **values: str) -> str:
+        """Fill the slots; values must already be escaped for the output format."""
+        return self.format(*[values[name] for name in self.slots])
+
+
+class DigestRenderer:
+    """Renders job digests as HTML and plain text from templates compiled once.
+
+    Both bodies are built in a single pass over the jobs. Values are
+    HTML-escaped for the HTML body, and links that are not http(s) are
+    replaced with '#'.
+    """
+
+    def __init__(self):
+        self.html = {name: Template(source) for name, source in [
+            ('header', HTML_HEADER), ('list_header', HTML_LIST_HEADER), ('job', HTML_JOB),
+            ('empty', HTML_EMPTY), ('footer', HTML_FOOTER), ('sections_header', HTML_SECTIONS_HEADER),
+            ('section_header', HTML_SECTION_HEADER)]}
+        self.text = {name: Template(source) for name, source in [
+            ('header', TEXT_HEADER), ('list_header', TEXT_LIST_HEADER), ('job', TEXT_JOB),
+            ('empty', TEXT_EMPTY), ('footer', TEXT_FOOTER), ('sections_header', TEXT_SECTIONS_HEADER),
+            ('section_header', TEXT_SECTION_HEADER)]}
+
+    def render(self, jobs: List[Dict], job_role: str, location: str,
+               date: Optional[datetime] = None) -> Tuple[str, str]:
+        """Render the HTML and plain-text bodies of a digest."""
+        header = {
+            'job_role': str(job_role),
+            'location': str(location),
+            'date': (date or datetime.now()).strftime("%B %d, %Y"),
+            'count': str(len(jobs))
+        }
+        html = [self.html['header'].render(**{k: escape(v) for k, v in header.items()})]
+        text = [self.text['header'].render(**header)]
+
+        if jobs:
+            html.append(self.html['list_header'].render())
+            text.append(self.text['list_header'].render())
+        self._append_jobs(html, text, jobs)
+
+        html.append(self.html['footer'].render())
+        text.append(self.text['footer'].render())
+        return ''.join(html), ''.join(text)
+
+    def render_sections(self, sections: List[Dict], date: Optional[datetime] = None) -> Tuple[str, str]:
+        """Render one digest covering several searches, each dict holding jobs, job_role and location.
+
+        A single section renders exactly as ``render`` would.
+        """
+        if len(sections) == 1:
+            return self.render(sections[0]['jobs'], sections[0]['job_role'], sections[0]['location'], date)
+
+        header = {
+            'searches': ', '.join(f"{section['job_role']} in {section['location']}" for section in sections),
+            'date': (date or datetime.now()).strftime("%B %d, %Y"),
+            'count': str(sum(len(section['jobs']) for section in sections))
+        }
+        html = [self.html['sections_header'].render(**{k: escape(v) for k, v in header.items()})]
+        text = [self.text['sections_header'].render(**header)]
+
+        for section in sections:
+            values = {'job_role': str(section['job_role']), 'location': str(section['location']),
+                      'count': str(len(section['jobs']))}
+            html.append(self.html['section_header'].render(**{k: escape(v) for k, v in values.items()}))
+            text.append(self.text['section_header'].render(**values))
+            self._append_jobs(html, text, section['jobs'])
+
+        html.append(self.html['footer'].render())
+        text.append(self.text['footer'].render())
+        return ''.join(html), ''.join(text)
+
+    def _append_jobs(self, html: List[str], text: List[str], jobs: List[Dict]):
+        """Add numbered job entries, or the no-jobs note, to both bodies' fragment lists."""
+        if not jobs:
+            html.append(self.html['empty'].render())
+            text.append(self.text['empty'].render())
+            return
+
+        html_job = self.html['job'].format
+        text_job = self.text['job'].format
+        add_html = html.append
+        add_text = text.append
+        for number, job in enumerate(jobs, 1):
+            title = str(job.get('title', ''))
+            link = str(job.get('link', ''))
+            source = str(job.get('source', ''))
+            html_link = escape(link) if link.startswith(('http://', 'https://')) else '#'
+            add_html(html_job(number, escape(title), html_link, escape(source)))
+            add_text(text_job(number, title, link, source))
@@ -1,16 +1,25 @@
-import smtplib
+import asyncio
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import List, Dict
-from datetime import datetime
+from async_smtp import AsyncSMTPEngine
+from digest_template import DigestRenderer
+from smtp_pool import SMTPPool, CONNECTION_ERRORS
 
 class EmailSender:
-    def __init__(self):
+    def __init__(self, max_sessions: int = 4):
         self.smtp_server = "smtp.gmail.com"
         self.smtp_port = 587
         self.gmail_user = os.getenv("GMAIL_USER", "")
         self.gmail_password = os.getenv("GMAIL_PASSWORD", "")
+        
+        # Logged-in sessions are reused across messages; none is opened until the first send
+        self.pool = SMTPPool(self.smtp_server, self.smtp_port, self.gmail_user, self.gmail_password,
+                             max_sessions=max_sessions)
+        self.renderer = DigestRenderer()
     
     def send_job_email(self, recipient_email: str, jobs: List[Dict], job_role: str, location: str) -> bool:
         """Send job listings via email."""
@@ -19,21 +28,7 @@ class EmailSender:
             return False
         
         try:
-            # Create message
-            msg = MIMEMultipart()
-            msg['From'] = self.gmail_user
-            msg['To'] = recipient_email
-            msg['Subject'] = f"🤖 Daily Job Updates: {job_role} in {location}"
-            
-            # Create email body
-            body = self._create_email_body(jobs, job_role, location)
-            msg.attach(MIMEText(body, 'html'))
-            
-            # Send email
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.gmail_user, self.gmail_password)
-                server.send_message(msg)
+            self._send(self.build_job_message(recipient_email, jobs, job_role, location))
             
             print(f"Email sent successfully to {recipient_email}")
             return True
@@ -42,62 +37,64 @@ class EmailSender:
             print(f"Error sending email: {e}")
             return False
     
-    def _create_email_body(self, jobs: List[Dict], job_role: str, location: str) -> str:
-        """Create HTML email body with job listings."""
-        current_date = datetime.now().strftime("%B %d, %Y")
+    def deliver_digest(self, recipient_email: str, sections: List[Dict]):
+        """Send one email covering several searches, raising the error on failure."""
+        if not self.gmail_user or not self.gmail_password:
+            raise RuntimeError("Gmail credentials not configured")
+        
+        self._send(self.build_digest_message(recipient_email, sections))
+    
+    def send_many(self, messages: List[Dict]) -> List[bool]:
+        """Send a batch of job digests over the pooled SMTP sessions.
         
-        html_body = f"""
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                .header {{ background-color: #f4f4f4; padding: 20px; border-radius: 5px; margin-bottom: 20px; }}
-                .job-item {{ border: 1px solid #ddd; border-radius: 5px; padding: 15px; margin-bottom: 15px; }}
-                .job-title {{ font-size: 18px; font-weight: bold; color: #2c3e50; margin-bottom: 10px; }}
-                .job-link {{ color: #3498db; text-decoration: none; }}
-                .job-link:hover {{ text-decoration: underline; }}
-                .job-source {{ color: #7f8c8d; font-size: 14px; }}
-                .footer {{ margin-top: 30px; padding-top: 20px; border-top: 1px solid #ddd; text-align: center; color: #7f8c8d; }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h2>🤖 Your Daily Job Updates</h2>
-                <p><strong>Search:</strong> {job_role} in {location}</p>
-                <p><strong>Date:</strong> {current_date}</p>
-                <p><strong>Jobs Found:</strong> {len(jobs)}</p>
-            </div>
+        Each message is a dict of send_job_email's arguments: recipient_email,
+        jobs, job_role and location. Up to one message per pooled session is
+        in flight at a time. Returns whether each message was sent, in order.
         """
+        if not messages:
+            return []
         
-        if jobs:
-            html_body += "<h3>📋 Job Listings:</h3>"
-            
-            for i, job in enumerate(jobs, 1):
-                html_body += f"""
-                <div class="job-item">
-                    <div class="job-title">{i}. {job['title']}</div>
-                    <p><a href="{job['link']}" class="job-link" target="_blank">🔗 View Job Application</a></p>
-                    <p class="job-source">📍 Source: {job['source']}</p>
-                </div>
-                """
-        else:
-            html_body += """
-            <div class="job-item">
-                <p>No new job listings found for your search criteria today.</p>
-                <p>Try adjusting your search parameters or check back tomorrow!</p>
-            </div>
-            """
+        if not self.gmail_user or not self.gmail_password:
+            print("Gmail credentials not configured")
+            return [False] * len(messages)
         
-        html_body += """
-            <div class="footer">
-                <p>Sent by your AI Job Agent 🤖</p>
-                <p>This is an automated email. Please do not reply.</p>
-            </div>
-        </body>
-        </html>
-        """
+        with ThreadPoolExecutor(max_workers=self.pool.max_sessions) as executor:
+            return list(executor.map(lambda message: self.send_job_email(**message), messages))
+    
+    def build_job_message(self, recipient_email: str, jobs: List[Dict], job_role: str, location: str) -> MIMEMultipart:
+        """Build the digest message for a set of job listings, with HTML and plain-text parts."""
+        return self.build_digest_message(recipient_email, [{'jobs': jobs, 'job_role': job_role, 'location': location}])
+    
+    def build_digest_message(self, recipient_email: str, sections: List[Dict]) -> MIMEMultipart:
+        """Build one digest message with a section per search (dicts of jobs, job_role and location)."""
+        msg = MIMEMultipart('alternative')
+        msg['From'] = self.gmail_user
+        msg['To'] = recipient_email
+        if len(sections) == 1:
+            msg['Subject'] = f"🤖 Daily Job Updates: {sections[0]['job_role']} in {sections[0]['location']}"
+        else:
+            msg['Subject'] = f"🤖 Daily Job Updates: {len(sections)} saved searches"
         
-        return html_body
+        # Create email body; clients show the last part they can display
+        html_body, text_body = self.renderer.render_sections(sections)
+        msg.attach(MIMEText(text_body, 'plain'))
+        msg.attach(MIMEText(html_body, 'html'))
+        return msg
+    
+    def _send(self, msg: MIMEMultipart):
+        """Send a message over a pooled session, retrying once on a new session if it was dropped."""
+        for attempt in range(2):
+            try:
+                with self.pool.session() as server:
+                    server.send_message(msg)
+                return
+            except CONNECTION_ERRORS:
+                if attempt:
+                    raise
+    
+    def close(self):
+        """Log out of any pooled SMTP sessions."""
+        self.pool.close()
     
     def send_test_email(self, recipient_email: str) -> bool:
         """Send a test email to verify configuration."""
@@ -121,13 +118,78 @@ class EmailSender:
             
             msg.attach(MIMEText(body, 'html'))
             
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.gmail_user, self.gmail_password)
-                server.send_message(msg)
+            self._send(msg)
             
             return True
             
         except Exception as e:
             print(f"Error sending test email: {e}")
             return False
+
+class AsyncEmailSender(EmailSender):
+    """EmailSender whose messages go out through an asyncio SMTP engine.
+    
+    The engine runs on its own event loop thread, so callers keep the same
+    blocking API. send_many hands the whole batch to the engine at once:
+    up to ``concurrency`` messages in flight over at most
+    ``max_connections`` sessions to the SMTP server, instead of one thread
+    per session.
+    """
+    
+    def __init__(self, concurrency: int = 200, max_connections: int = 20, timeout: float = 30):
+        super().__init__(max_sessions=max_connections)
+        self.engine = AsyncSMTPEngine(self.gmail_user, self.gmail_password, concurrency=concurrency,
+                                      max_connections=max_connections, timeout=timeout)
+        self._loop = None
+        self._loop_lock = threading.Lock()
+    
+    def send_many(self, messages: List[Dict]) -> List[bool]:
+        """Send a batch of job digests concurrently; see EmailSender.send_many."""
+        if not messages:
+            return []
+            
+        if not self.gmail_user or not self.gmail_password:
+            print("Gmail credentials not configured")
+            return [False] * len(messages)
+            
+        built = [self.build_job_message(**message) for message in messages]
+        errors = self._run(self.engine.send_many(built, self.smtp_server, self.smtp_port))
+        
+        results = []
+        for message, error in zip(messages, errors):
+            if error is None:
+                print(f"Email sent successfully to {message['recipient_email']}")
+            else:
+                print(f"Error sending email: {error}")
+            results.append(error is None)
+        return results
+    
+    def _send(self, msg: MIMEMultipart):
+        """Send a message through the engine, waiting for the outcome."""
+        self._run(self.engine.send(msg, self.smtp_server, self.smtp_port))
+    
+    def _run(self, coroutine):
+        """Run a coroutine on the engine's event loop thread and wait for its result."""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name='smtp-engine', daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+    
+    def close(self):
+        """Log out of the engine's sessions and stop its event loop."""
+        super().close()
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            asyncio.run_coroutine_threadsafe(self.engine.close(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+
+def create_email_sender() -> EmailSender:
+    """Get the email sender JOBHUNTER_SMTP_ENGINE asks for: 'thread' (default) or 'async'."""
+    engine = os.getenv("JOBHUNTER_SMTP_ENGINE", "")
+    if engine == 'async':
+        return AsyncEmailSender()
+    if engine not in ('', 'thread'):
+        print(f"Unknown JOBHUNTER_SMTP_ENGINE: {engine}")
+    return EmailSender()
@@ -0,0 +1,176 @@
+import os
+from html.parser import HTMLParser
+from typing import List, Optional, Tuple
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+
+class ResultExtractor:
+    """Pulls (title, link) pairs out of a search results page."""
+
+    name = "base"
+
+    def extract(self, content: bytes, max_results: Optional[int] = None) -> List[Tuple[str, str]]:
+        raise NotImplementedError
+
+
+class SoupExtractor(ResultExtractor):
+    """Full BeautifulSoup tree walk over the known result container selectors."""
+
+    name = "soup"
+
+    selectors = [
+        'div.g',
+        'div.tF2Cxc',
+        'div.MjjYud',
+        'div[data-ved]',
+        'div.ZINbbc'
+    ]
+
+    def extract(self, content: bytes, max_results: Optional[int] = None) -> List[Tuple[str, str]]:
+        soup = BeautifulSoup(content, 'html.parser')
+
+        containers = []
+        for selector in self.selectors:
+            containers = soup.select(selector)
+            if containers:
+                break
+
+        results = []
+        for container in containers:
+            title_elem = container.find('h3')
+            link_elem = container.find('a')
+
+            if title_elem and link_elem and link_elem.get('href'):
+                results.append((title_elem.get_text(strip=True), link_elem.get('href')))
+
+                if max_results and len(results) >= max_results:
+                    break
+
+        return results
+
+
+class LxmlExtractor(ResultExtractor):
+    """Pairs each h3 with its link using lxml's C parser and XPath."""
+
+    name = "lxml"
+
+    def extract(self, content: bytes, max_results: Optional[int] = None) -> List[Tuple[str, str]]:
+        if not content:
+            return []
+
+        document = lxml.html.fromstring(content)
+
+        results = []
+        for heading in document.iter('h3'):
+            # Results either wrap the heading in the link or put it beside it
+            links = heading.xpath('ancestor::a[@href][1]') or heading.xpath('ancestor::div[1]//a[@href][1]')
+            if not links:
+                continue
+
+            title = ' '.join(heading.text_content().split())
+            if title:
+                results.append((title, links[0].get('href')))
+
+                if max_results and len(results) >= max_results:
+                    break
+
+        return results
+
+
+class _ResultTokenizer(HTMLParser):
+    def __init__(self, max_results: Optional[int]):
+        super().__init__(convert_charrefs=True)
+        self.max_results = max_results
+        self.results = []
+        self.link_stack = []
+        self.title_parts = None
+        self.pending_title = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a':
+            href = dict(attrs).get('href')
+            self.link_stack.append(href)
+
+            # A heading outside any link takes the next link that follows it
+            if self.pending_title and href:
+                self._add(self.pending_title, href)
+                self.pending_title = None
+        elif tag == 'h3':
+            self.title_parts = []
+
+    def handle_endtag(self, tag):
+        if tag == 'a' and self.link_stack:
+            self.link_stack.pop()
+        elif tag == 'h3' and self.title_parts is not None:
+            title = ' '.join(''.join(self.title_parts).split())
+            self.title_parts = None
+
+            href = next((link for link in reversed(self.link_stack) if link), None)
+            if title and href:
+                self._add(title, href)
+            elif title:
+                self.pending_title = title
+
+    def handle_data(self, data):
+        if self.title_parts is not None:
+            self.title_parts.append(data)
+
+    def _add(self, title: str, href: str):
+        if self.max_results and len(self.results) >= self.max_results:
+            return
+        self.results.append((title, href))
+
+
+class StreamingExtractor(ResultExtractor):
+    """Single-pass tokenizer that never builds a document tree."""
+
+    name = "stream"
+
+    def extract(self, content: bytes, max_results: Optional[int] = None) -> List[Tuple[str, str]]:
+        tokenizer = _ResultTokenizer(max_results)
+        tokenizer.feed(content.decode('utf-8', errors='replace'))
+        tokenizer.close()
+        return tokenizer.results
+
+
+EXTRACTORS = {
+    'lxml': LxmlExtractor,
+    'stream': StreamingExtractor,
+    'soup': SoupExtractor,
+}
+
+
+def get_extractor(name: Optional[str] = None) -> ResultExtractor:
+    """Get a result extractor by name, defaulting to the fastest available engine."""
+    name = name or os.getenv("JOBHUNTER_PARSER", "")
+    if not name:
+        name = 'lxml' if lxml is not None else 'stream'
+
+    if name == 'lxml' and lxml is None:
+        print("lxml is not installed, falling back to the streaming parser")
+        name = 'stream'
+
+    if name not in EXTRACTORS:
+        raise ValueError(f"Unknown parser engine: {name}")
+
+    return EXTRACTORS[name]()
+
+
+def extract_results(content: bytes, extractor: ResultExtractor,
+                    max_results: Optional[int] = None) -> List[Tuple[str, str]]:
+    """Extract result pairs, falling back to BeautifulSoup if the engine finds none."""
+    try:
+        results = extractor.extract(content, max_results)
+    except Exception as e:
+        print(f"Error in {extractor.name} parser: {e}")
+        results = []
+
+    if not results and not isinstance(extractor, SoupExtractor):
+        results = SoupExtractor().extract(content, max_results)
+
+    return results
@@ -0,0 +1,230 @@
+import sqlite3
+import json
+import time
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlparse
+from requests import Response
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Freshness lifetime in seconds per source, matched on hostname suffix
+DEFAULT_TTLS = {
+    'google.com': 15 * 60,
+    'linkedin.com': 60 * 60,
+    'indeed.com': 60 * 60,
+    'glassdoor.com': 60 * 60,
+    'naukri.com': 60 * 60,
+    'monster.com': 60 * 60,
+}
+
+# Headers describing the wire encoding of a body that has already been decoded
+HOP_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length', 'connection'}
+
+
+def build_response(request, status: int, headers: Dict, body: bytes, connection=None) -> Response:
+    """Build a requests Response for a request from stored parts."""
+    response = Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    response.encoding = get_encoding_from_headers(response.headers)
+    response._content = body
+    response.url = request.url
+    response.request = request
+    response.reason = 'OK' if status < 400 else 'Error'
+    response.connection = connection
+    return response
+
+
+class ResponseCache:
+    def __init__(self, db_path: str = "http_cache.db", max_bytes: int = 50 * 1024 * 1024,
+                 default_ttl: int = 30 * 60, ttls: Optional[Dict[str, int]] = None,
+                 touch_interval: float = 60):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        # Reads only rewrite last_access once it is this many seconds stale;
+        # eviction order does not need finer resolution than that
+        self.touch_interval = touch_interval
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.counters = {'hits': 0, 'misses': 0, 'revalidated': 0, 'stores': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.init_cache()
+
+    def init_cache(self):
+        """Initialize the SQLite table holding cached responses."""
+        with self._lock:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS responses (
+                    url TEXT PRIMARY KEY,
+                    status INTEGER NOT NULL,
+                    headers TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    size INTEGER NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            ''')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS idx_last_access ON responses(last_access)')
+            self._conn.commit()
+
+    def ttl_for(self, url: str) -> int:
+        """Get the freshness lifetime for a URL based on its host."""
+        host = urlparse(url).hostname or ""
+        for suffix, ttl in self.ttls.items():
+            if host == suffix or host.endswith('.' + suffix):
+                return ttl
+        return self.default_ttl
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Look up a cached entry, marking it as recently used."""
+        with self._lock:
+            row = self._conn.execute('''
+                SELECT status, headers, body, etag, last_modified, expires_at, last_access
+                FROM responses WHERE url = ?
+            ''', (url,)).fetchone()
+
+            if row is None:
+                return None
+
+            now = time.time()
+            if now - row[6] >= self.touch_interval:
+                self._conn.execute('UPDATE responses SET last_access = ? WHERE url = ?', (now, url))
+                self._conn.commit()
+
+        return {
+            'status': row[0],
+            'headers': json.loads(row[1]),
+            'body': row[2],
+            'etag': row[3],
+            'last_modified': row[4],
+            'fresh': row[5] > now
+        }
+
+    def put(self, url: str, response: Response):
+        """Store a successful response and evict old entries past the size cap."""
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in HOP_HEADERS}
+        body = response.content
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute('''
+                INSERT OR REPLACE INTO responses
+                (url, status, headers, body, etag, last_modified, size, expires_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (url, response.status_code, json.dumps(headers), body,
+                  response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                  len(body), now + self.ttl_for(url), now))
+            self.counters['stores'] += 1
+            self._evict()
+            self._conn.commit()
+
+    def refresh(self, url: str):
+        """Extend the lifetime of an entry the server confirmed is unchanged."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute('UPDATE responses SET expires_at = ?, last_access = ? WHERE url = ?',
+                               (now + self.ttl_for(url), now, url))
+            self._conn.commit()
+
+    def _evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute('SELECT url, size FROM responses ORDER BY last_access').fetchall()
+        for url, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute('DELETE FROM responses WHERE url = ?', (url,))
+            total -= size
+            self.counters['evictions'] += 1
+
+    def record(self, counter: str):
+        """Increment a hit/miss counter."""
+        with self._lock:
+            self.counters[counter] += 1
+
+    def stats(self) -> Dict:
+        """Get cache counters along with current entry count and size."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses'
+            ).fetchone()
+            stats = dict(self.counters)
+
+        lookups = stats['hits'] + stats['misses'] + stats['revalidated']
+        stats['entries'] = entries
+        stats['bytes'] = size
+        stats['hit_rate'] = (stats['hits'] + stats['revalidated']) / lookups if lookups else 0.0
+        return stats
+
+    def clear(self):
+        """Remove every cached response."""
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class CachingAdapter(BaseAdapter):
+    """Transport adapter serving GET requests from a ResponseCache.
+
+    Fresh entries are returned without touching the network. Stale entries
+    are revalidated with If-None-Match / If-Modified-Since, and a 304 reply
+    is answered from the stored body.
+    """
+
+    def __init__(self, cache: ResponseCache, inner: Optional[BaseAdapter] = None):
+        super().__init__()
+        self.cache = cache
+        self.inner = inner or HTTPAdapter()
+
+    def send(self, request, **kwargs):
+        if request.method != 'GET':
+            return self.inner.send(request, **kwargs)
+
+        entry = self.cache.get(request.url)
+
+        if entry and entry['fresh']:
+            self.cache.record('hits')
+            return self._build_response(request, entry)
+
+        if entry:
+            if entry['etag']:
+                request.headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                request.headers['If-Modified-Since'] = entry['last_modified']
+
+        response = self.inner.send(request, **kwargs)
+
+        if response.status_code == 304 and entry:
+            self.cache.record('revalidated')
+            self.cache.refresh(request.url)
+            return self._build_response(request, entry)
+
+        self.cache.record('misses')
+        if response.status_code == 200:
+            self.cache.put(request.url, response)
+
+        return response
+
+    def _build_response(self, request, entry: Dict) -> Response:
+        """Rebuild a requests Response from a cache entry."""
+        response = build_response(request, entry['status'], entry['headers'], entry['body'], self)
+        response.from_cache = True
+        return response
+
+    def close(self):
+        self.inner.close()
@@ -0,0 +1,232 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Optional
+from urllib.parse import quote, unquote
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from http_cache import HOP_HEADERS, build_response
+
+DEFAULT_FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+class FixtureStore:
+    """Recorded HTTP responses on disk, keyed by method and URL.
+
+    ``http_index.json`` in the fixtures directory maps each request to its
+    status, headers and a body file path relative to that directory, so
+    several URLs can share one captured body.
+    """
+
+    def __init__(self, root: str = DEFAULT_FIXTURES_DIR):
+        self.root = root
+        self.index_path = os.path.join(root, 'http_index.json')
+        self._lock = threading.Lock()
+        self._bodies = {}
+        self.entries = {}
+
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                self.entries = json.load(f)
+
+    @staticmethod
+    def key(method: str, url: str) -> str:
+        return f"{method.upper()} {url}"
+
+    def lookup(self, method: str, url: str) -> Optional[Dict]:
+        """Get the recorded status, headers and body for a request, if any."""
+        entry = self.entries.get(self.key(method, url))
+        if entry is None:
+            return None
+
+        with self._lock:
+            body = self._bodies.get(entry['body'])
+            if body is None:
+                with open(os.path.join(self.root, entry['body']), 'rb') as f:
+                    body = f.read()
+                self._bodies[entry['body']] = body
+
+        return {'status': entry['status'], 'headers': entry['headers'], 'body': body}
+
+    def add(self, method: str, url: str, status: int, headers: Dict, body: bytes,
+            body_path: Optional[str] = None):
+        """Record a response, storing its body under bodies/ unless a path is given."""
+        if body_path is None:
+            body_path = f"bodies/{hashlib.sha1(body).hexdigest()}.html"
+
+        path = os.path.join(self.root, body_path)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(body)
+
+        headers = {k: v for k, v in headers.items() if k.lower() not in HOP_HEADERS}
+        with self._lock:
+            self.entries[self.key(method, url)] = {'status': status, 'headers': headers, 'body': body_path}
+            self._bodies[body_path] = body
+
+    def save(self):
+        """Write the index back to disk."""
+        with self._lock:
+            os.makedirs(self.root, exist_ok=True)
+            with open(self.index_path, 'w') as f:
+                json.dump(self.entries, f, indent=1, sort_keys=True)
+                f.write('\n')
+
+
+class RecordingAdapter(BaseAdapter):
+    """Passes requests through to the network and records every response."""
+
+    def __init__(self, store: FixtureStore, inner: Optional[BaseAdapter] = None):
+        super().__init__()
+        self.store = store
+        self.inner = inner or HTTPAdapter()
+
+    def send(self, request, **kwargs):
+        response = self.inner.send(request, **kwargs)
+        self.store.add(request.method, request.url, response.status_code,
+                       dict(response.headers), response.content)
+        self.store.save()
+        return response
+
+    def close(self):
+        self.inner.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """Serves requests from recorded fixtures without touching the network."""
+
+    def __init__(self, store: FixtureStore, strict: bool = True):
+        super().__init__()
+        self.store = store
+        self.strict = strict
+
+    def send(self, request, **kwargs):
+        entry = self.store.lookup(request.method, request.url)
+        if entry is None:
+            if self.strict:
+                raise requests.ConnectionError(f"No recorded response for {request.method} {request.url}")
+            return build_response(request, 404, {}, b'', self)
+        return build_response(request, entry['status'], entry['headers'], entry['body'], self)
+
+    def close(self):
+        pass
+
+
+class LoopbackAdapter(HTTPAdapter):
+    """Sends every request to a local FixtureServer instead of the real host."""
+
+    def __init__(self, server_url: str):
+        super().__init__(pool_maxsize=64)
+        self.server_url = server_url.rstrip('/')
+
+    def send(self, request, **kwargs):
+        original_url = request.url
+        request.url = f"{self.server_url}/{quote(original_url, safe='')}"
+        response = super().send(request, **kwargs)
+        response.url = request.url = original_url
+        return response
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+
+        url = unquote(self.path.lstrip('/'))
+        entry = server.store.lookup('GET', url)
+        with server.count_lock:
+            server.request_count += 1
+
+        if entry is None:
+            status, headers, body = 404, {}, b''
+        else:
+            status, headers, body = entry['status'], entry['headers'], entry['body']
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _FixtureHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class FixtureServer:
+    """Local stand-in HTTP server answering from a FixtureStore.
+
+    Requests arrive with the original URL percent-encoded as the path (see
+    LoopbackAdapter). ``latency`` adds a fixed delay to every response to
+    approximate a remote host.
+    """
+
+    def __init__(self, store: FixtureStore, latency: float = 0.0, host: str = '127.0.0.1', port: int = 0):
+        self.httpd = _FixtureHTTPServer((host, port), _FixtureHandler)
+        self.httpd.store = store
+        self.httpd.latency = latency
+        self.httpd.request_count = 0
+        self.httpd.count_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def request_count(self) -> int:
+        return self.httpd.request_count
+
+    def start(self) -> 'FixtureServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def replace_transport(session: requests.Session, transport: BaseAdapter):
+    """Swap the innermost network adapter under each of the session's adapters.
+
+    Caching and rate limiting adapters wrap their transport in ``inner``;
+    this keeps those layers in place and replaces only what they wrap.
+    """
+    for prefix in ('http://', 'https://'):
+        adapter = session.adapters.get(prefix)
+        if adapter is None or not hasattr(adapter, 'inner'):
+            session.mount(prefix, transport)
+            continue
+
+        while hasattr(adapter.inner, 'inner'):
+            adapter = adapter.inner
+        adapter.inner = transport
+
+
+def install_from_env(session: requests.Session):
+    """Record or replay a session's traffic if JOBHUNTER_HTTP_MODE asks for it."""
+    mode = os.getenv("JOBHUNTER_HTTP_MODE", "")
+    if not mode:
+        return
+
+    store = FixtureStore(os.getenv("JOBHUNTER_FIXTURES", DEFAULT_FIXTURES_DIR))
+    if mode == 'record':
+        replace_transport(session, RecordingAdapter(store))
+    elif mode == 'replay':
+        replace_transport(session, ReplayAdapter(store))
+    else:
+        print(f"Unknown JOBHUNTER_HTTP_MODE: {mode}")
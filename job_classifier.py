@@ -0,0 +1,134 @@
+import json
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+DEFAULT_RULES = {
+    # Titles containing any of these are guides or articles, not postings
+    'irrelevant_keywords': [
+        'courses', 'training', 'salary', 'interview questions',
+        'resume', 'tips', 'news', 'blog', 'article'
+    ],
+    # URL fragments that mark a job posting on any site
+    'job_patterns': [
+        r'/jobs/',
+        r'/job/',
+        r'/career/',
+        r'/vacancy/',
+        r'/opening/',
+        r'jobs\.html',
+        r'job-',
+        r'career-'
+    ],
+    # Known job boards by hostname suffix
+    'sources': {
+        'linkedin.com': 'LinkedIn',
+        'indeed.com': 'Indeed',
+        'glassdoor.com': 'Glassdoor',
+        'glassdoor.co.in': 'Glassdoor',
+        'naukri.com': 'Naukri',
+        'monster.com': 'Monster'
+    }
+}
+
+
+class JobClassifier:
+    """Precompiled relevance and source rules for search results.
+
+    Keywords and URL patterns are each folded into one alternation regex,
+    and sources are looked up by walking the hostname's suffixes in a dict,
+    so the cost per result does not grow with the number of rules.
+    """
+
+    def __init__(self, rules: Optional[Dict] = None):
+        if rules is not None and not isinstance(rules, dict):
+            raise ValueError("Classifier rules must be a JSON object")
+        rules = {**DEFAULT_RULES, **(rules or {})}
+        self._check_rules(rules)
+
+        # An empty list leaves its check out, rather than matching every result
+        keywords = sorted(rules['irrelevant_keywords'], key=len, reverse=True)
+        self.irrelevant_re = self._compile_any(re.escape(k) for k in keywords)
+        self.job_path_re = self._compile_any(f'(?:{p})' for p in rules['job_patterns'])
+        self.sources = {suffix.lower(): name for suffix, name in rules['sources'].items()}
+
+    @staticmethod
+    def _check_rules(rules: Dict):
+        """Raise ValueError if a rules section does not have the expected shape."""
+        for section in ('irrelevant_keywords', 'job_patterns'):
+            value = rules[section]
+            if not isinstance(value, list) or not all(isinstance(item, str) and item for item in value):
+                raise ValueError(f"Classifier rules '{section}' must be a list of non-empty strings")
+        sources = rules['sources']
+        if not isinstance(sources, dict) or not all(
+                isinstance(suffix, str) and isinstance(name, str) for suffix, name in sources.items()):
+            raise ValueError("Classifier rules 'sources' must map hostname suffixes to names")
+
+    @staticmethod
+    def _compile_any(patterns: Iterable[str]) -> Optional[re.Pattern]:
+        """Fold patterns into one case-insensitive alternation, or None if there are none."""
+        patterns = list(patterns)
+        if not patterns:
+            return None
+        return re.compile('|'.join(patterns), re.IGNORECASE)
+
+    @classmethod
+    def from_file(cls, path: str) -> 'JobClassifier':
+        """Build a classifier from a JSON rules file, defaulting any missing sections."""
+        with open(path) as f:
+            return cls(json.load(f))
+
+    @classmethod
+    def from_env(cls) -> 'JobClassifier':
+        """Build a classifier from JOBHUNTER_CLASSIFIER_RULES if set, else the defaults."""
+        path = os.getenv("JOBHUNTER_CLASSIFIER_RULES", "")
+        if path:
+            try:
+                return cls.from_file(path)
+            except (OSError, ValueError, re.error) as e:
+                print(f"Error loading classifier rules from {path}: {e}")
+        return cls()
+
+    def _is_irrelevant(self, title: str) -> bool:
+        return self.irrelevant_re is not None and self.irrelevant_re.search(title) is not None
+
+    def _has_job_path(self, link: str) -> bool:
+        return self.job_path_re is not None and self.job_path_re.search(link) is not None
+
+    def _job_board(self, url: str) -> Optional[str]:
+        """Find the job board a URL belongs to by its hostname suffix."""
+        host = (urlparse(url).hostname or "").lower()
+        labels = host.split('.')
+        for i in range(len(labels) - 1):
+            name = self.sources.get('.'.join(labels[i:]))
+            if name:
+                return name
+        return None
+
+    def classify(self, title: str, link: str) -> Optional[Dict]:
+        """Classify one result, returning a job dict or None if irrelevant."""
+        if not title or not link or self._is_irrelevant(title):
+            return None
+
+        board = self._job_board(link)
+        if board is None and not self._has_job_path(link):
+            return None
+
+        return {
+            'title': title,
+            'link': link,
+            'source': board or "Other"
+        }
+
+    def classify_batch(self, results: Iterable[Tuple[str, str]], limit: Optional[int] = None) -> List[Dict]:
+        """Classify a whole results page, keeping relevant jobs up to limit."""
+        jobs = []
+        classify = self.classify
+        for title, link in results:
+            job = classify(title, link)
+            if job is not None:
+                jobs.append(job)
+                if limit and len(jobs) >= limit:
+                    break
+        return jobs
@@ -7,8 +7,10 @@ from datetime import datetime, timedelta
 import os
 import json
 from database import DatabaseManager
-from email_sender import EmailSender
+from db_writer import DatabaseWriter
+from email_sender import create_email_sender
 from job_scraper import JobScraper
+from outbox import EmailOutbox
 from scheduler import JobScheduler
 
 # Initialize session state
@@ -19,10 +21,28 @@ if 'scheduler_thread' not in st.session_state:
 if 'jobs_found' not in st.session_state:
     st.session_state.jobs_found = []
 
+# Latency budget in seconds for an interactive search
+SEARCH_DEADLINE = 15
+
+@st.cache_resource
+def get_job_scraper() -> JobScraper:
+    """One scraper per server process, so its pools, caps and caches outlive each rerun."""
+    return JobScraper()
+
 # Initialize components
 db_manager = DatabaseManager()
-email_sender = EmailSender()
-job_scraper = JobScraper()
+email_sender = create_email_sender()
+job_scraper = get_job_scraper()
+
+@st.cache_resource
+def get_db_writer() -> DatabaseWriter:
+    """One background database writer per server process, shared across reruns."""
+    return DatabaseWriter(DatabaseManager())
+
+@st.cache_resource
+def get_outbox() -> EmailOutbox:
+    """One set of outbox sender threads per server process, shared across reruns."""
+    return EmailOutbox(DatabaseManager(), create_email_sender(), db_writer=get_db_writer()).start()
 
 def main():
     st.title("🤖 AI Job Agent")
@@ -82,12 +102,16 @@ def search_jobs_now(job_role, location, job_type, experience_years, email):
             # Build search query
             query = job_scraper.build_search_query(job_role, location, job_type, experience_years)
             
-            # Search for jobs
-            jobs = job_scraper.search_jobs(query)
+            # Search for jobs within the latency budget
+            report = job_scraper.search_jobs_report(query, deadline=SEARCH_DEADLINE)
+            jobs = report['jobs']
             
             if jobs:
                 st.success(f"Found {len(jobs)} job opportunities!")
                 
+                if report['partial']:
+                    st.caption(f"⏱️ Showing results collected within {SEARCH_DEADLINE}s. Still waiting on: {', '.join(report['pending'])}")
+                
                 # Show note about demo listings
                 st.info("💡 **Demo Mode**: These are sample job listings. The links will take you to the job site's search page with your criteria. In production, the system would fetch real job postings from LinkedIn, Indeed, Glassdoor, and other job sites.")
                 
@@ -98,21 +122,20 @@ def search_jobs_now(job_role, location, job_type, experience_years, email):
                     st.markdown(f"📍 Source: {job['source']}")
                     st.markdown("---")
                 
-                # Save to database
-                for job in jobs:
-                    db_manager.save_job(
-                        title=job['title'],
-                        link=job['link'],
-                        email=email,
-                        source=job['source'],
-                        search_query=query
-                    )
+                # Only save and email postings not already delivered to this address
+                new_jobs = db_manager.filter_new_jobs(email, jobs)
                 
-                # Send email
-                if email_sender.send_job_email(email, jobs, job_role, location):
-                    st.success("✅ Job listings sent to your email!")
+                if new_jobs:
+                    # Save to database in the background
+                    get_db_writer().save_jobs(new_jobs, email, query)
+                    
+                    # Queue the email; the outbox sends it and retries on failure
+                    if get_outbox().enqueue(email, new_jobs, job_role, location) is not None:
+                        st.success(f"✅ {len(new_jobs)} new job listings queued for your email!")
+                    else:
+                        st.warning("⚠️ Jobs found but the email could not be queued. Please try again.")
                 else:
-                    st.warning("⚠️ Jobs found but email delivery failed. Please check your email settings.")
+                    st.info("All of these jobs were already sent to your email.")
                 
                 st.session_state.jobs_found = jobs
                 
@@ -138,7 +161,9 @@ def schedule_daily_search(job_role, location, job_type, experience_years, email,
             preferred_time=preferred_time,
             db_manager=db_manager,
             email_sender=email_sender,
-            job_scraper=job_scraper
+            job_scraper=job_scraper,
+            db_writer=get_db_writer(),
+            outbox=get_outbox()
         )
         
         # Start scheduler in background thread
@@ -158,72 +183,119 @@ def job_logs_tab():
     st.header("📊 Job Search History")
     
     try:
-        # Get job logs from database
-        logs = db_manager.get_job_logs()
+        summary = db_manager.get_job_log_summary()
         
-        if logs:
-            df = pd.DataFrame(logs)
-            
+        if summary['total']:
             # Display summary statistics
             col1, col2, col3 = st.columns(3)
             with col1:
-                st.metric("Total Jobs Found", len(df))
+                st.metric("Total Jobs Found", summary['total'])
             with col2:
-                st.metric("Unique Companies", df['source'].nunique())
+                st.metric("Unique Companies", summary['sources'])
             with col3:
-                st.metric("Search Sessions", df['email'].nunique())
+                st.metric("Search Sessions", summary['emails'])
+            
+            jobs_per_day = db_manager.get_jobs_per_day(30)
+            if jobs_per_day:
+                st.caption("Jobs saved per day (last 30 days, UTC)")
+                st.bar_chart(pd.Series(jobs_per_day, name="Jobs"))
             
             # Display filters
             st.subheader("Filter Results")
-            col1, col2 = st.columns(2)
+            search_text = st.text_input("🔎 Search Job History", placeholder="e.g., python remote intern")
+            col1, col2, col3 = st.columns(3)
             
             with col1:
-                email_filter = st.selectbox("Filter by Email", ["All"] + df['email'].unique().tolist())
+                email_filter = st.selectbox("Filter by Email", ["All"] + db_manager.get_emails())
             with col2:
                 date_filter = st.date_input("Filter by Date", value=None)
+            with col3:
+                page_size = st.selectbox("Jobs per Page", [25, 50, 100], index=1)
             
-            # Apply filters
-            filtered_df = df.copy()
-            if email_filter != "All":
-                filtered_df = filtered_df[filtered_df['email'] == email_filter]
+            # Filters are applied in SQL as index range scans
+            email = email_filter if email_filter != "All" else None
+            start = end = None
             if date_filter:
-                filtered_df = filtered_df[pd.to_datetime(filtered_df['timestamp']).dt.date == date_filter]
+                start = date_filter
+                end = date_filter + timedelta(days=1)
+            
+            # Keep a stack of keyset cursors, restarting when the filters change
+            filter_key = (email, start, page_size)
+            if st.session_state.get('log_filter_key') != filter_key:
+                st.session_state.log_filter_key = filter_key
+                st.session_state.log_cursors = [None]
+            
+            if search_text.strip():
+                # Keyword search ranks matches across the whole history
+                page = {
+                    'jobs': db_manager.search_jobs_history(search_text, email=email, limit=page_size),
+                    'next_cursor': None
+                }
+            else:
+                page = db_manager.get_job_logs_page(
+                    email=email, page_size=page_size, cursor=st.session_state.log_cursors[-1],
+                    start=start, end=end
+                )
             
-            # Display filtered results
+            # Display only the visible page
             st.subheader("Job Listings")
-            for _, row in filtered_df.iterrows():
-                with st.expander(f"{row['title']} - {row['timestamp']}"):
-                    st.write(f"**Link:** {row['link']}")
-                    st.write(f"**Source:** {row['source']}")
-                    st.write(f"**Email:** {row['email']}")
-                    st.write(f"**Search Query:** {row['search_query']}")
-                    st.write(f"**Timestamp:** {row['timestamp']}")
+            for job in page['jobs']:
+                with st.expander(f"{job['title']} - {job['timestamp']}"):
+                    st.write(f"**Link:** {job['link']}")
+                    st.write(f"**Source:** {job['source']}")
+                    st.write(f"**Email:** {job['email']}")
+                    st.write(f"**Search Query:** {job['search_query']}")
+                    st.write(f"**Timestamp:** {job['timestamp']}")
             
-            # Export functionality
-            st.subheader("Export Data")
-            col1, col2 = st.columns(2)
+            if not page['jobs']:
+                st.info("No jobs match these filters.")
             
-            with col1:
-                csv = filtered_df.to_csv(index=False)
-                st.download_button(
-                    label="📥 Download as CSV",
-                    data=csv,
-                    file_name=f"job_logs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv"
-                )
+            if search_text.strip():
+                st.caption(f"Showing the top {page_size} matches by relevance. The date filter does not apply to keyword search.")
+            else:
+                col1, col2, col3 = st.columns([1, 2, 1])
+                with col1:
+                    if st.button("⬅️ Newer", disabled=len(st.session_state.log_cursors) == 1):
+                        st.session_state.log_cursors.pop()
+                        st.rerun()
+                with col2:
+                    st.caption(f"Page {len(st.session_state.log_cursors)}")
+                with col3:
+                    if st.button("Older ➡️", disabled=page['next_cursor'] is None):
+                        st.session_state.log_cursors.append(page['next_cursor'])
+                        st.rerun()
             
-            with col2:
-                # Convert to Excel bytes
-                excel_buffer = pd.io.common.BytesIO()
-                filtered_df.to_excel(excel_buffer, index=False)
-                excel_data = excel_buffer.getvalue()
-                
-                st.download_button(
-                    label="📥 Download as Excel",
-                    data=excel_data,
-                    file_name=f"job_logs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            # Export functionality, built on demand from all filtered rows
+            st.subheader("Export Data")
+            if st.button("📦 Prepare Export"):
+                filtered_df = pd.DataFrame(
+                    [job for jobs in db_manager.iter_job_logs(email=email, start=start, end=end) for job in jobs],
+                    columns=['title', 'link', 'email', 'source', 'search_query', 'timestamp']
                 )
+                
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    csv = filtered_df.to_csv(index=False)
+                    st.download_button(
+                        label="📥 Download as CSV",
+                        data=csv,
+                        file_name=f"job_logs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                        mime="text/csv"
+                    )
+                
+                with col2:
+                    # Convert to Excel bytes
+                    excel_buffer = pd.io.common.BytesIO()
+                    filtered_df.to_excel(excel_buffer, index=False)
+                    excel_data = excel_buffer.getvalue()
+                    
+                    st.download_button(
+                        label="📥 Download as Excel",
+                        data=excel_data,
+                        file_name=f"job_logs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                    )
         
         else:
             st.info("No job search history found. Start by searching for jobs in the 'Job Search' tab!")
@@ -274,6 +346,10 @@ def settings_tab():
         if gmail_user and gmail_password:
             st.success("✅ Email configuration detected")
             st.write(f"Gmail User: {gmail_user}")
+            
+            outbox = db_manager.get_outbox_stats()
+            st.write(f"Outbox: {outbox['pending'] + outbox['sending']} waiting, "
+                     f"{outbox['sent']} sent, {outbox['failed']} failed")
         else:
             st.error("❌ Email configuration missing")
             st.write("Please set GMAIL_USER and GMAIL_PASSWORD environment variables")
@@ -0,0 +1,145 @@
+import atexit
+import random
+import smtplib
+import threading
+import time
+from typing import Dict, List, Optional
+from database import DatabaseManager
+from db_writer import DatabaseWriter
+from email_sender import EmailSender
+
+
+class EmailOutbox:
+    """Durable digest queue in jobs.db, drained by a pool of sender threads.
+
+    ``enqueue`` stores the digest and returns at once. Each of ``workers``
+    threads claims one due email at a time under a lease, sends it over the
+    sender's pooled SMTP sessions and records the outcome and latency.
+    Failures are retried after an exponential backoff of ``base_delay``
+    seconds doubling per attempt, up to ``max_delay``, and given up on after
+    ``max_attempts`` or a permanent (5xx) rejection. Emails whose worker
+    died mid-send are picked up again once their lease runs out, up to
+    ``max_attempts`` times.
+
+    Digests enqueued with ``hold_seconds`` wait for other searches' results
+    for the same recipient and go out as one sectioned email.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, email_sender: EmailSender,
+                 db_writer: Optional[DatabaseWriter] = None, workers: int = 4,
+                 max_attempts: int = 5, base_delay: float = 30, max_delay: float = 3600,
+                 lease_seconds: int = 300, poll_interval: float = 5):
+        self.db_manager = db_manager
+        self.email_sender = email_sender
+        self.db_writer = db_writer
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.counters = {'sent': 0, 'retried': 0, 'failed': 0}
+        self._counters_lock = threading.Lock()
+        self._wake = threading.Condition()
+        self._stopping = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> 'EmailOutbox':
+        """Start the sender threads, if they are not already running."""
+        if self._threads:
+            return self
+        self._stopping.clear()
+        self._threads = [threading.Thread(target=self._run, name=f'outbox-{i}', daemon=True)
+                         for i in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+        atexit.register(self.stop)
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the sender threads once they finish the email in hand.
+
+        Emails still queued stay in the outbox for the next start.
+        """
+        self._stopping.set()
+        with self._wake:
+            self._wake.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def enqueue(self, recipient_email: str, jobs: List[Dict], job_role: str, location: str,
+                hold_seconds: int = 0) -> Optional[int]:
+        """Queue a job digest for delivery, returning its outbox id or None on error.
+
+        A digest held for ``hold_seconds`` absorbs those enqueued for the same
+        recipient in the meantime; they share its id.
+        """
+        email_id = self.db_manager.enqueue_email(recipient_email, jobs, job_role, location, hold_seconds)
+        if email_id is not None:
+            with self._wake:
+                self._wake.notify()
+        return email_id
+
+    def stats(self) -> Dict:
+        """Get this process's sent/retried/failed counters and the outbox totals."""
+        with self._counters_lock:
+            stats = dict(self.counters)
+        stats['outbox'] = self.db_manager.get_outbox_stats()
+        return stats
+
+    def _run(self):
+        while not self._stopping.is_set():
+            emails = self.db_manager.claim_emails(1, self.lease_seconds, self.max_attempts)
+            if not emails:
+                # Retries come due and other processes enqueue without notifying us
+                with self._wake:
+                    self._wake.wait(self.poll_interval)
+                continue
+            self._deliver(emails[0])
+
+    def _deliver(self, email: Dict):
+        start = time.perf_counter()
+        try:
+            self.email_sender.deliver_digest(email['recipient'], email['sections'])
+        except Exception as e:
+            latency_ms = int((time.perf_counter() - start) * 1000)
+            self._failed(email, e, latency_ms)
+            return
+
+        latency_ms = int((time.perf_counter() - start) * 1000)
+        self.db_manager.complete_email(email['id'], latency_ms)
+        jobs = [job for section in email['sections'] for job in section['jobs']]
+        if jobs:
+            if self.db_writer:
+                self.db_writer.mark_jobs_delivered(email['recipient'], jobs)
+            else:
+                self.db_manager.mark_jobs_delivered(email['recipient'], jobs)
+
+        with self._counters_lock:
+            self.counters['sent'] += 1
+        print(f"Email sent successfully to {email['recipient']}")
+
+    def _failed(self, email: Dict, error: Exception, latency_ms: int):
+        # Rejected logins are kept retrying, since fixing the credentials should not lose mail
+        if isinstance(error, smtplib.SMTPRecipientsRefused):
+            # A 4xx refusal (mailbox busy, greylisting) may succeed later
+            permanent = all(code >= 500 for code, _ in error.recipients.values())
+        else:
+            permanent = (isinstance(error, smtplib.SMTPResponseException) and error.smtp_code >= 500
+                         and not isinstance(error, smtplib.SMTPAuthenticationError))
+
+        if permanent or email['attempts'] >= self.max_attempts:
+            self.db_manager.fail_email(email['id'], str(error), latency_ms)
+            with self._counters_lock:
+                self.counters['failed'] += 1
+            print(f"Giving up on email to {email['recipient']} after {email['attempts']} attempts: {error}")
+            return
+
+        # Jitter spreads out retries of emails that failed together
+        delay = min(self.max_delay, self.base_delay * 2 ** (email['attempts'] - 1))
+        retry_at = int(time.time() + delay * random.uniform(0.5, 1.0))
+        self.db_manager.fail_email(email['id'], str(error), latency_ms, retry_at)
+        with self._counters_lock:
+            self.counters['retried'] += 1
+        print(f"Error sending email to {email['recipient']}, retrying in {retry_at - int(time.time())}s: {error}")
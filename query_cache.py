@@ -0,0 +1,151 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional
+
+
+class _Flight:
+    """A computation in progress that other callers can wait on."""
+
+    def __init__(self, expires: Optional[float]):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.cacheable = False
+        self.report = {}
+        self.expires = expires
+
+
+class QueryResultCache:
+    """Memoizes search results by normalized query, shared across callers.
+
+    Entries expire after ``ttl`` seconds and the least recently used entry
+    is evicted past ``max_entries``. Concurrent misses for the same key are
+    coalesced: one caller computes while the rest wait for its result.
+    """
+
+    def __init__(self, ttl: float = 15 * 60, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.counters = {'hits': 0, 'misses': 0, 'coalesced': 0, 'evictions': 0}
+        self._entries = OrderedDict()
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(query: str, max_results: int) -> tuple:
+        """Build a cache key that ignores case and spacing differences in the query."""
+        return (' '.join(query.lower().split()), max_results)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], List[Dict]],
+                       timeout: Optional[float] = None,
+                       cacheable: Optional[Callable[[List[Dict]], bool]] = None,
+                       report: Optional[Dict] = None, expires: Optional[float] = None) -> List[Dict]:
+        """Return the cached result for key, computing it at most once per expiry.
+
+        Callers waiting on another caller's computation give up with
+        TimeoutError after ``timeout`` seconds. Results for which
+        ``cacheable`` returns False are handed out but not stored.
+
+        ``report`` is a dict that ``compute`` fills in about how it went;
+        a caller joining another's computation gets that caller's report
+        copied into its own. A caller whose ``expires`` (a time.monotonic()
+        deadline) is later than the computing caller's does not accept an
+        uncacheable result from it, and computes again instead.
+        """
+        if report is None:
+            report = {}
+        wait_until = time.monotonic() + timeout if timeout is not None else None
+
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    expires_at, result = entry
+                    if expires_at > time.monotonic():
+                        self._entries.move_to_end(key)
+                        self.counters['hits'] += 1
+                        return self._copy(result)
+                    del self._entries[key]
+
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = _Flight(expires)
+                    self._flights[key] = flight
+                    self.counters['misses'] += 1
+                else:
+                    self.counters['coalesced'] += 1
+
+            if leader:
+                break
+
+            remaining = wait_until - time.monotonic() if wait_until is not None else None
+            if not flight.done.wait(remaining):
+                raise TimeoutError("Timed out waiting for an in-flight search")
+            if flight.error is not None:
+                raise flight.error
+            if flight.cacheable or not self._outlasts(expires, flight.expires):
+                report.update(flight.report)
+                return self._copy(flight.result)
+
+        try:
+            flight.result = compute()
+        except Exception as e:
+            flight.error = e
+            raise
+        else:
+            flight.cacheable = cacheable is None or cacheable(flight.result)
+            if flight.cacheable:
+                self.put(key, flight.result)
+        finally:
+            flight.report = dict(report)
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+        return self._copy(flight.result)
+
+    def put(self, key: Hashable, result: List[Dict]):
+        """Store a result, evicting the least recently used entries past the cap."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.counters['evictions'] += 1
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Drop one entry, or every entry if no key is given."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict:
+        """Get hit/miss counters and the current entry count."""
+        with self._lock:
+            stats = dict(self.counters)
+            stats['entries'] = len(self._entries)
+        return stats
+
+    @staticmethod
+    def _outlasts(expires: Optional[float], other: Optional[float]) -> bool:
+        """Whether a deadline (None for no deadline) is later than another."""
+        if other is None:
+            return False
+        return expires is None or expires > other
+
+    @staticmethod
+    def _copy(result: List[Dict]) -> List[Dict]:
+        """Hand each caller its own job dicts so one caller cannot alter another's results."""
+        return [dict(job) for job in result]
+
+
+_default_cache = QueryResultCache()
+
+
+def get_query_cache() -> QueryResultCache:
+    """Get the process-wide query result cache shared by every scraper."""
+    return _default_cache
@@ -0,0 +1,209 @@
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, Optional
+from urllib.parse import urlparse
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.exceptions import Timeout
+
+# Sustained requests per second and burst size per host, matched on hostname suffix
+DEFAULT_HOST_RATES = {
+    'google.com': (0.5, 3),
+}
+DEFAULT_RATE = (2.0, 4)
+
+# Status codes telling us the host wants us to slow down
+BACKOFF_STATUSES = {429, 503}
+
+# Per-thread events set once a request has got through the limiter
+_passed = threading.local()
+
+
+class RateLimitTimeout(Timeout):
+    """The host's budget would not allow the request before its timeout ran out."""
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        """Add the tokens accrued since the last update."""
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def reserve(self, max_wait: Optional[float] = None) -> Optional[float]:
+        """Take a token and return how long the caller must wait before using it.
+        
+        If that would be longer than ``max_wait``, the token is put back and
+        None is returned.
+        """
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens -= 1
+
+        # Negative tokens are requests already queued ahead of this one
+        ready_at = self.updated + max(0.0, -self.tokens) / self.rate
+        wait = max(0.0, ready_at - now)
+        if max_wait is not None and wait > max_wait:
+            self.tokens += 1
+            return None
+        return wait
+
+    def slow_down(self, delay: Optional[float], min_rate: float):
+        """Halve the rate and hold back every request for the given delay."""
+        now = time.monotonic()
+        self._refill(now)
+        self.rate = max(min_rate, self.rate / 2)
+        if delay is None:
+            delay = 1 / self.rate
+        self.tokens = min(self.tokens, 0.0)
+        self.updated = max(self.updated, now + delay)
+
+    def speed_up(self):
+        """Recover the rate additively towards its configured value."""
+        self._refill(time.monotonic())
+        self.rate = min(self.base_rate, self.rate + self.base_rate * 0.1)
+
+
+class HostRateLimiter:
+    """Token-bucket rate limiter keyed by host, safe to share across threads.
+
+    Each host gets a bucket sized from ``host_rates`` (or ``default_rate``).
+    A 429/503 halves the host's rate and honors any Retry-After; successful
+    responses then restore the rate gradually.
+    """
+
+    def __init__(self, host_rates: Optional[Dict] = None, default_rate: tuple = DEFAULT_RATE,
+                 min_rate: float = 0.05):
+        self.host_rates = dict(DEFAULT_HOST_RATES if host_rates is None else host_rates)
+        self.default_rate = default_rate
+        self.min_rate = min_rate
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host: str) -> TokenBucket:
+        """Get or create the bucket for a host. Caller must hold the lock."""
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate, capacity = self.default_rate
+            for suffix, config in self.host_rates.items():
+                if host == suffix or host.endswith('.' + suffix):
+                    rate, capacity = config
+                    break
+            bucket = TokenBucket(rate, capacity)
+            self._buckets[host] = bucket
+        return bucket
+
+    def acquire(self, host: str, timeout: Optional[float] = None) -> float:
+        """Block until the host's budget allows another request; return the time waited.
+        
+        Raises RateLimitTimeout, without using up the host's budget, if the
+        wait would be longer than ``timeout`` seconds.
+        """
+        with self._lock:
+            wait = self._bucket(host).reserve(timeout)
+
+        if wait is None:
+            raise RateLimitTimeout(f"Rate limit for {host} allows no request within {timeout:.1f}s")
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def backoff(self, host: str, retry_after: Optional[float] = None):
+        """Slow requests to a host down after it signalled overload."""
+        with self._lock:
+            self._bucket(host).slow_down(retry_after, self.min_rate)
+
+    def record_success(self, host: str):
+        """Let a host's rate recover after a successful response."""
+        with self._lock:
+            self._bucket(host).speed_up()
+
+    def get_host_rate(self, host: str) -> float:
+        """Get the current allowed requests per second for a host."""
+        with self._lock:
+            return self._bucket(host).rate
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given as seconds or an HTTP date."""
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+@contextmanager
+def notify_when_sent(event: threading.Event) -> Iterator[threading.Event]:
+    """Set event once a request made by this thread inside the block gets past the rate limiter."""
+    _passed.event = event
+    try:
+        yield event
+    finally:
+        _passed.event = None
+
+
+_default_limiter = HostRateLimiter()
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    """Get the process-wide rate limiter shared by every scraper."""
+    return _default_limiter
+
+
+class RateLimitedAdapter(BaseAdapter):
+    """Transport adapter that paces requests through a HostRateLimiter.
+    
+    A request is given up on with RateLimitTimeout if the limiter would
+    hold it past its timeout. Responses carry ``network_latency``: the
+    seconds spent on the network, excluding time queued in the limiter.
+    """
+
+    def __init__(self, limiter: Optional[HostRateLimiter] = None, inner: Optional[BaseAdapter] = None):
+        super().__init__()
+        self.limiter = limiter or get_rate_limiter()
+        self.inner = inner or HTTPAdapter()
+
+    def send(self, request, **kwargs):
+        host = (urlparse(request.url).hostname or "").lower()
+        timeout = kwargs.get('timeout')
+        if isinstance(timeout, tuple):
+            timeout = timeout[0]
+        self.limiter.acquire(host, timeout)
+
+        event = getattr(_passed, 'event', None)
+        if event is not None:
+            event.set()
+            
+        started = time.monotonic()
+        response = self.inner.send(request, **kwargs)
+        response.network_latency = time.monotonic() - started
+
+        if response.status_code in BACKOFF_STATUSES:
+            self.limiter.backoff(host, parse_retry_after(response.headers.get('Retry-After')))
+        else:
+            self.limiter.record_success(host)
+
+        return response
+
+    def close(self):
+        self.inner.close()
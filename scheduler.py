@@ -4,13 +4,29 @@ import threading
 from datetime import datetime, time as dt_time
 from typing import Optional
 from database import DatabaseManager
+from db_writer import DatabaseWriter
 from email_sender import EmailSender
 from job_scraper import JobScraper
+from outbox import EmailOutbox
+
+# Latency budget in seconds for a scheduled search
+SEARCH_DEADLINE = 60
+
+# Daily time to archive or delete jobs past the retention age
+RETENTION_TIME = "03:30"
+
+# Seconds between checks for due jobs in each scheduler's loop
+CHECK_INTERVAL = 60
+
+# Seconds a queued digest waits to be merged with other searches' results for the
+# same email; schedulers due at the same minute all fire within one check of each other
+COALESCE_WINDOW = CHECK_INTERVAL
 
 class JobScheduler:
     def __init__(self, job_role: str, location: str, job_type: str, experience_years: str, 
                  email: str, preferred_time: dt_time, db_manager: DatabaseManager, 
-                 email_sender: EmailSender, job_scraper: JobScraper):
+                 email_sender: EmailSender, job_scraper: JobScraper,
+                 db_writer: Optional[DatabaseWriter] = None, outbox: Optional[EmailOutbox] = None):
         self.job_role = job_role
         self.location = location
         self.job_type = job_type
@@ -20,17 +36,23 @@ class JobScheduler:
         self.db_manager = db_manager
         self.email_sender = email_sender
         self.job_scraper = job_scraper
+        self.db_writer = db_writer
+        self.outbox = outbox
         self.is_running = False
         self.stop_event = threading.Event()
         
+        # Each scheduler keeps its own jobs, so starting or stopping one leaves the others alone
+        self.schedule = schedule.Scheduler()
+    
     def schedule_job(self):
         """Schedule the daily job search."""
         # Clear any existing scheduled jobs
-        schedule.clear()
+        self.schedule.clear()
         
         # Schedule the job for the specified time
         time_str = self.preferred_time.strftime("%H:%M")
-        schedule.every().day.at(time_str).do(self.run_job_search)
+        self.schedule.every().day.at(time_str).do(self.run_job_search)
+        self.schedule.every().day.at(RETENTION_TIME).do(self.run_retention)
         
         print(f"Job search scheduled for {time_str} daily")
     
@@ -45,39 +67,60 @@ class JobScheduler:
             )
             
             # Search for jobs
-            jobs = self.job_scraper.search_jobs(query)
+            jobs = self.job_scraper.search_jobs(query, deadline=SEARCH_DEADLINE)
+            
+            # Skip postings this subscriber has already been sent
+            jobs = self.db_manager.filter_new_jobs(self.email, jobs)
             
             if jobs:
-                # Save jobs to database
-                for job in jobs:
-                    self.db_manager.save_job(
-                        title=job['title'],
-                        link=job['link'],
-                        email=self.email,
-                        source=job['source'],
-                        search_query=query
-                    )
+                # Save jobs to database, through the background writer when there is one
+                if self.db_writer:
+                    self.db_writer.save_jobs(jobs, self.email, query)
+                else:
+                    self.db_manager.save_jobs(jobs, self.email, query)
                 
+                # Hand the digest to the outbox, which marks the jobs delivered once it is sent
+                if self.outbox:
+                    self.outbox.enqueue(self.email, jobs, self.job_role, self.location, COALESCE_WINDOW)
+                    print(f"Queued {len(jobs)} jobs for {self.email}")
+                    return
+                    
                 # Send email
                 success = self.email_sender.send_job_email(
                     self.email, jobs, self.job_role, self.location
                 )
                 
                 if success:
+                    if self.db_writer:
+                        self.db_writer.mark_jobs_delivered(self.email, jobs)
+                    else:
+                        self.db_manager.mark_jobs_delivered(self.email, jobs)
                     print(f"Successfully sent {len(jobs)} jobs to {self.email}")
                 else:
                     print(f"Failed to send email to {self.email}")
             else:
-                print(f"No jobs found for {self.email}")
+                print(f"No new jobs found for {self.email}")
                 
                 # Send empty results email
-                self.email_sender.send_job_email(
-                    self.email, [], self.job_role, self.location
-                )
+                if self.outbox:
+                    self.outbox.enqueue(self.email, [], self.job_role, self.location, COALESCE_WINDOW)
+                else:
+                    self.email_sender.send_job_email(
+                        self.email, [], self.job_role, self.location
+                    )
                 
         except Exception as e:
             print(f"Error in scheduled job search: {e}")
     
+    def run_retention(self):
+        """Archive or delete jobs older than the retention age."""
+        try:
+            counts = self.db_manager.purge_old_jobs()
+            print(f"Retention: removed {counts['deleted']} old jobs, archived {counts['archived']}")
+            
+        except Exception as e:
+            print(f"Error in scheduled retention: {e}")
+    
     def run(self):
         """Main scheduler loop."""
         self.is_running = True
@@ -87,12 +130,12 @@ class JobScheduler:
         
         while not self.stop_event.is_set():
             try:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
+                self.schedule.run_pending()
+                time.sleep(CHECK_INTERVAL)
                 
             except Exception as e:
                 print(f"Scheduler error: {e}")
-                time.sleep(60)
+                time.sleep(CHECK_INTERVAL)
         
         print("Scheduler stopped")
         self.is_running = False
@@ -100,19 +143,19 @@ class JobScheduler:
     def stop(self):
         """Stop the scheduler."""
         self.stop_event.set()
-        schedule.clear()
+        self.schedule.clear()
         print("Scheduler stop signal sent")
     
     def get_next_run_time(self) -> Optional[datetime]:
         """Get the next scheduled run time."""
-        jobs = schedule.get_jobs()
+        jobs = self.schedule.get_jobs()
         if jobs:
             return jobs[0].next_run
         return None
     
     def is_scheduled(self) -> bool:
         """Check if a job is currently scheduled."""
-        return len(schedule.get_jobs()) > 0
+        return len(self.schedule.get_jobs()) > 0
     
     def get_schedule_info(self) -> dict:
         """Get information about the current schedule."""
@@ -0,0 +1,147 @@
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+# Errors meaning a session was lost, so the message can be retried on a fresh one
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+# Errors the server answered with, leaving the session itself usable
+REPLY_ERRORS = (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused)
+
+
+class SMTPPool:
+    """Authenticated SMTP sessions kept open and handed out for reuse.
+
+    Connecting, STARTTLS and login happen once per session instead of once
+    per message. A session idle for more than ``noop_after`` seconds is
+    checked with NOOP before it is handed out, and one idle for more than
+    ``idle_timeout`` seconds is closed rather than trusted. At most
+    ``max_sessions`` are open at once; further callers wait for one.
+    """
+
+    def __init__(self, host: str, port: int, user: str, password: str, max_sessions: int = 4,
+                 timeout: float = 30, idle_timeout: float = 120, noop_after: float = 15,
+                 use_tls: bool = True):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.max_sessions = max_sessions
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.noop_after = noop_after
+        self.use_tls = use_tls
+        self.counters = {'connects': 0, 'reuses': 0, 'health_checks': 0, 'discards': 0}
+        self._idle: List[Tuple[smtplib.SMTP, float]] = []
+        self._open = 0
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def session(self) -> Iterator[smtplib.SMTP]:
+        """Borrow a logged-in session, returning it to the pool afterwards.
+
+        If the block raises anything but an error reply from the server, the
+        session is closed instead of reused.
+        """
+        server = self._acquire()
+        try:
+            yield server
+        except REPLY_ERRORS:
+            self._release(server)
+            raise
+        except BaseException:
+            self._discard(server)
+            raise
+        else:
+            self._release(server)
+
+    def _acquire(self) -> smtplib.SMTP:
+        while True:
+            with self._cond:
+                while not self._idle and self._open >= self.max_sessions:
+                    self._cond.wait()
+
+                if self._idle:
+                    # Most recently used first: the likeliest to still be alive
+                    server, last_used = self._idle.pop()
+                else:
+                    self._open += 1
+                    server = None
+
+            if server is None:
+                try:
+                    return self._connect()
+                except BaseException:
+                    with self._cond:
+                        self._open -= 1
+                        self._cond.notify()
+                    raise
+
+            idle_for = time.monotonic() - last_used
+            if idle_for > self.idle_timeout or (idle_for > self.noop_after and not self._healthy(server)):
+                self._discard(server)
+                continue
+
+            with self._cond:
+                self.counters['reuses'] += 1
+            return server
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                server.starttls()
+            if self.user:
+                server.login(self.user, self.password)
+        except BaseException:
+            self._close(server)
+            raise
+
+        with self._cond:
+            self.counters['connects'] += 1
+        return server
+
+    def _healthy(self, server: smtplib.SMTP) -> bool:
+        with self._cond:
+            self.counters['health_checks'] += 1
+        try:
+            return server.noop()[0] == 250
+        except OSError:
+            return False
+
+    def _release(self, server: smtplib.SMTP):
+        with self._cond:
+            self._idle.append((server, time.monotonic()))
+            self._cond.notify()
+
+    def _discard(self, server: smtplib.SMTP):
+        self._close(server)
+        with self._cond:
+            self._open -= 1
+            self.counters['discards'] += 1
+            self._cond.notify()
+
+    @staticmethod
+    def _close(server: smtplib.SMTP):
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def stats(self) -> Dict:
+        """Get connect/reuse/health-check/discard counters and open session counts."""
+        with self._cond:
+            stats = dict(self.counters)
+            stats['open'] = self._open
+            stats['idle'] = len(self._idle)
+        return stats
+
+    def close(self):
+        """Log out of every idle session."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+        for server, _ in idle:
+            self._close(server)
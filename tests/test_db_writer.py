@@ -0,0 +1,49 @@
+import threading
+import time
+from db_writer import DatabaseWriter
+
+
+class FakeDatabase:
+    """Stands in for DatabaseManager, accepting every write."""
+
+    def write_batch(self, writes):
+        return [True] * len(writes)
+
+
+def test_write_racing_close_resolves():
+    writer = DatabaseWriter(FakeDatabase(), max_delay=0)
+
+    # Hold each write between the closed check and the queue for a moment,
+    # long enough for close() to run in between if nothing stops it
+    put = writer._queue.put
+    entered = threading.Event()
+
+    def slow_put(item, *args, **kwargs):
+        if item is not None:
+            entered.set()
+            time.sleep(0.2)
+        put(item, *args, **kwargs)
+
+    writer._queue.put = slow_put
+    futures = []
+
+    def submit():
+        futures.append(writer.mark_jobs_delivered("user@example.com", []))
+
+    submitter = threading.Thread(target=submit)
+    submitter.start()
+    entered.wait(1)
+    writer.close()
+    submitter.join()
+
+    assert futures[0].result(timeout=1) is True
+
+
+def test_writes_after_close_fail():
+    writer = DatabaseWriter(FakeDatabase())
+    writer.close()
+
+    future = writer.save_jobs([], "user@example.com")
+
+    assert isinstance(future.exception(timeout=1), RuntimeError)
+    assert not writer.flush(timeout=1)
@@ -0,0 +1,83 @@
+import threading
+import time
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+from http_cache import ResponseCache
+from http_replay import replace_transport
+from job_scraper import JobScraper
+from rate_limiter import HostRateLimiter
+
+HOST = 'jobs.example.com'
+
+
+class SlowAdapter(BaseAdapter):
+    """Answers every request after a fixed delay, counting the calls."""
+
+    def __init__(self, delay: float):
+        super().__init__()
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'ok'
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def scraper(tmp_path):
+    scraper = JobScraper(per_host_limit=16, hedge_workers=1,
+                         cache=ResponseCache(str(tmp_path / 'http_cache.db')),
+                         rate_limiter=HostRateLimiter(host_rates={HOST: (1000, 1000)}))
+    yield scraper
+    scraper.cache.close()
+
+
+def fetch_all(scraper: JobScraper, count: int) -> float:
+    """Fetch count distinct URLs at once from their own threads, returning the seconds taken."""
+    threads = [threading.Thread(target=scraper._fetch, args=(f"https://{HOST}/jobs/{i}",))
+               for i in range(count)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.monotonic() - start
+
+
+def test_primaries_on_warmed_host_do_not_queue_behind_hedge_workers(scraper):
+    adapter = SlowAdapter(0.2)
+    replace_transport(scraper.session, adapter)
+    # Warm the host with a p95 well above the real latency, so no hedge fires
+    for _ in range(scraper.min_hedge_samples):
+        scraper._record_latency(f"https://{HOST}/", 1.0)
+    assert scraper._hedge_delay(f"https://{HOST}/") is not None
+
+    elapsed = fetch_all(scraper, 8)
+
+    # One hedge worker would serialize eight 0.2 s primaries into 1.6 s
+    assert elapsed < 0.8
+    assert adapter.calls == 8
+
+
+def test_slow_primary_gets_a_hedge(scraper):
+    adapter = SlowAdapter(0.3)
+    replace_transport(scraper.session, adapter)
+    for _ in range(scraper.min_hedge_samples):
+        scraper._record_latency(f"https://{HOST}/", 0.05)
+
+    response = scraper._fetch(f"https://{HOST}/jobs/slow")
+
+    assert response.status_code == 200
+    assert adapter.calls == 2
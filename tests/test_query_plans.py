@@ -0,0 +1,65 @@
+import time
+import pytest
+from database import DatabaseManager, DELIVERED_HASHES_SQL, RECENT_JOBS_SQL, STALE_JOBS_SQL
+
+EMAIL = "user@example.com"
+
+# Aliases the queries give the large tables, which must never be scanned
+LARGE_TABLES = {'jobs', 'j', 'delivered_links', 'd'}
+
+
+def assert_searches(plan, table, index, keys):
+    """Check the plan reads table by a range of index on keys, and never scans a large table."""
+    scans = [step for step in plan if step.startswith('SCAN ') and step.split()[1] in LARGE_TABLES]
+    assert not scans, plan
+
+    step = next((step for step in plan if step.startswith(f'SEARCH {table} ')), None)
+    assert step is not None, plan
+    assert step.startswith((f'SEARCH {table} USING INDEX {index} ',
+                            f'SEARCH {table} USING COVERING INDEX {index} ',
+                            f'SEARCH {table} USING {index} ')), plan
+    assert step.endswith(f'({keys})'), plan
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseManager(str(tmp_path / 'jobs.db'))
+    for i in range(50):
+        db.save_job(f"Job {i}", f"https://example.com/jobs/{i}", f"user{i % 5}@example.com")
+    yield db
+    db.close()
+
+
+def test_recent_jobs_use_subscriber_created_index(db):
+    plan = db.explain_query_plan(RECENT_JOBS_SQL, (EMAIL, int(time.time()) - 86400))
+
+    assert_searches(plan, 'j', 'idx_subscriber_created', 'subscriber_id=? AND created_at>?')
+
+
+@pytest.mark.parametrize('email, cursor, since, until, index, keys', [
+    (EMAIL, None, 'day', 'now', 'idx_subscriber_created', 'subscriber_id=? AND created_at>? AND created_at<?'),
+    (None, None, 'day', 'now', 'idx_created', 'created_at>? AND created_at<?'),
+    (EMAIL, 'week', None, None, 'idx_subscriber_created', 'subscriber_id=? AND created_at<?'),
+])
+def test_log_pages_search_an_index(db, email, cursor, since, until, index, keys):
+    now = int(time.time())
+    times = {'now': now, 'day': now - 86400, 'week': now - 7 * 86400, None: None}
+    if cursor is not None:
+        cursor = (times[cursor], 50)
+
+    sql, params = db.job_logs_page_query(email, 50, cursor, times[since], times[until])
+
+    assert_searches(db.explain_query_plan(sql, params), 'j', index, keys)
+
+
+def test_delivered_links_are_looked_up_by_primary_key(db):
+    sql = DELIVERED_HASHES_SQL.format(placeholders='?,?,?')
+    plan = db.explain_query_plan(sql, (EMAIL, 1, 2, 3))
+
+    assert_searches(plan, 'd', 'PRIMARY KEY', 'subscriber_id=? AND link_hash=?')
+
+
+def test_retention_walks_the_last_seen_index(db):
+    plan = db.explain_query_plan(STALE_JOBS_SQL, (int(time.time()) - 180 * 86400, 500))
+
+    assert_searches(plan, 'jobs', 'idx_last_seen', 'last_seen_at<?')
@@ -0,0 +1,37 @@
+import time
+import pytest
+from database import DatabaseManager
+
+DAY = 86400
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseManager(str(tmp_path / 'jobs.db'))
+    yield db
+    db.close()
+
+
+def save(db: DatabaseManager, link: str, created_days_ago: int, seen_days_ago: int):
+    db.save_job("Developer", link, "user@example.com")
+    now = int(time.time())
+    with db._get_connection() as conn:
+        conn.execute('UPDATE jobs SET created_at = ?, last_seen_at = ? WHERE link = ?',
+                     (now - created_days_ago * DAY, now - seen_days_ago * DAY, link))
+
+
+def links(db: DatabaseManager):
+    with db._get_connection() as conn:
+        return {row[0] for row in conn.execute('SELECT link FROM jobs')}
+
+
+@pytest.mark.parametrize('archive', [False, True])
+def test_purge_goes_by_last_seen(db, tmp_path, archive):
+    save(db, "https://example.com/jobs/live", created_days_ago=400, seen_days_ago=1)
+    save(db, "https://example.com/jobs/gone", created_days_ago=400, seen_days_ago=200)
+    save(db, "https://example.com/jobs/new", created_days_ago=2, seen_days_ago=2)
+
+    counts = db.purge_old_jobs(180, str(tmp_path / 'archive') if archive else '', pause=0)
+
+    assert links(db) == {"https://example.com/jobs/live", "https://example.com/jobs/new"}
+    assert counts == {'archived': 1 if archive else 0, 'deleted': 1}
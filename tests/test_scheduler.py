@@ -0,0 +1,21 @@
+from datetime import time as dt_time
+from scheduler import JobScheduler
+
+
+def make_scheduler(email: str, at: dt_time) -> JobScheduler:
+    return JobScheduler("Developer", "Remote", "Fresher Job", "", email, at,
+                        db_manager=None, email_sender=None, job_scraper=None)
+
+
+def test_schedulers_keep_their_own_jobs():
+    first = make_scheduler("a@example.com", dt_time(9, 0))
+    second = make_scheduler("b@example.com", dt_time(9, 0))
+
+    first.schedule_job()
+    second.schedule_job()
+    assert len(first.schedule.get_jobs()) == 2
+    assert len(second.schedule.get_jobs()) == 2
+
+    second.stop()
+    assert first.is_scheduled()
+    assert not second.is_scheduled()
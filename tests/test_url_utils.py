@@ -0,0 +1,20 @@
+from url_utils import canonicalize_url, link_hash
+
+
+def test_tracking_params_are_dropped():
+    assert (canonicalize_url("https://www.example.com/jobs/1?utm_source=x&gclid=1&mc_cid=2&fbclid=3")
+            == canonicalize_url("http://example.com/jobs/1/"))
+
+
+def test_identifying_params_stay_distinct():
+    for key in ('position', 'id', 'source', 'ref', 'from', 'sid', 'pagenum'):
+        first = f"https://careers.acme.com/jobs?{key}=42"
+        second = f"https://careers.acme.com/jobs?{key}=43"
+        assert canonicalize_url(first) != canonicalize_url(second)
+        assert link_hash(first) != link_hash(second)
+
+
+def test_google_redirect_is_decoded_once():
+    wrapped = "/url?q=https://x.com/jobs%3Fq%3Dc%252B%252B&sa=U"
+    assert canonicalize_url(wrapped) == canonicalize_url("https://x.com/jobs?q=c%2B%2B")
+    assert canonicalize_url(wrapped) != canonicalize_url("https://x.com/jobs?q=c  ")
@@ -0,0 +1,56 @@
+import hashlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that only track the click and never change the posting.
+# Generic names such as 'ref', 'source' or 'position' are left alone, since
+# some career sites use them to pick the posting itself.
+TRACKING_PARAMS = {
+    'gclid', 'fbclid', 'msclkid', 'dclid', 'yclid', 'igshid', 'mkt_tok',
+    'ref_src', 'refid', 'trk', 'trkinfo', 'trackingid', 'tracking_id', '_ga', '_gl'
+}
+TRACKING_PREFIXES = ('utm_', 'mc_')
+
+def canonicalize_url(url: str) -> str:
+    """Reduce a job link to a canonical form so variants of one posting compare equal."""
+    if not url:
+        return ""
+
+    url = url.strip()
+
+    # Unwrap Google redirect remnants such as /url?q=<target>&sa=U
+    if url.startswith('/url?') or ('://www.google.' in url and '/url?' in url):
+        # parse_qsl already percent-decodes the target; decoding it again mangles its own query
+        params = dict(parse_qsl(urlsplit(url).query))
+        target = params.get('q') or params.get('url')
+        if target:
+            url = target
+
+    if '://' not in url:
+        url = 'https://' + url.lstrip('/')
+
+    parts = urlsplit(url)
+
+    host = (parts.hostname or "").lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path or '/'
+    if len(path) > 1:
+        path = path.rstrip('/')
+
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    query.sort()
+
+    # http and https variants of a posting are the same page
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+
+def link_hash(url: str) -> int:
+    """Hash a link's canonical form into a signed 64-bit integer for compact indexing."""
+    digest = hashlib.blake2b(canonicalize_url(url).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)